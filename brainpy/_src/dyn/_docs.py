@@ -41,6 +41,56 @@ lif_doc = '''
 ltc_doc = 'with liquid time-constant'
 
 
+ref_counter_doc = '''
+    ref_counter: bool. Track the refractory period with an ``int32`` counter of the steps
+      since the last spike (``steps_since_spike``) instead of the float ``t_last_spike``.
+      It halves the memory traffic of the spike timing, but assumes a constant ``dt``.
+      Default is ``False``.
+'''.strip()
+
+spk_packed_doc = '''
+    spk_packed: bool. Also store the spikes packed into the bits of ``uint32`` words as
+      ``spike_bits``, which is 32 times smaller than the dense spikes to monitor or to delay.
+      Default is ``False``.
+'''.strip()
+
+ref_spk_packed_doc = '''
+    spk_packed: bool. Also store the spikes and the refractory states packed into the bits of
+      ``uint32`` words as ``spike_bits`` and ``refractory_bits``, which are 32 times smaller
+      than the dense arrays to monitor or to delay. Default is ``False``.
+'''.strip()
+
+V_dtype_doc = '''
+    V_dtype: The data type to store the membrane potential, e.g., ``bfloat16`` to halve its
+      memory traffic. The integration is still computed in the default float type. It is
+      ignored in ``TrainingMode``. Default is ``None``, using the default float type.
+'''.strip()
+
+adex_V_dtype_doc = '''
+    V_dtype: The data type to store the membrane potential and the adaptation current,
+      e.g., ``float16`` to halve their memory traffic. The integration is still computed in
+      the default float type. The updates smaller than the resolution of the type are lost,
+      so ``bfloat16``, which resolves only 0.5 mV around -65 mV, is too coarse for the usual
+      time steps. It is ignored in ``TrainingMode``. Default is ``None``, using the default
+      float type.
+'''.strip()
+
+gif_V_dtype_doc = '''
+    V_dtype: The data type to store the membrane potential, the threshold and the internal
+      currents, e.g., ``float16`` to halve their memory traffic. The integration is still
+      computed in the default float type. The updates smaller than the resolution of the
+      type are lost, e.g., ``float16`` resolves only 0.03 mV around -50 mV, which is coarser
+      than the per-step drift of the threshold with the default parameters. It is ignored
+      in ``TrainingMode``. Default is ``None``, using the default float type.
+'''.strip()
+
+max_spikes_doc = '''
+    max_spikes: int. If provided, ``update()`` returns the indices of the spiking neurons
+      (see :py:func:`~.spike_indices`) instead of the dense spikes, which is much smaller
+      when the firing is sparse. The dense ``spike`` variable is still kept. Default is ``None``.
+'''.strip()
+
+
 dual_exp_syn_doc = r'''
 
   **Model Descriptions**
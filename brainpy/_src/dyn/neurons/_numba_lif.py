@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+
+"""
+Numba kernels of the integrate-and-fire neurons.
+
+These kernels are used when the neurons are updated eagerly on CPU, i.e.,
+outside any JAX transformation, where the dispatch of many small XLA operations
+dominates the cost of one step. All arrays are flattened. An input is either
+an array with one element, or an array with one element per neuron.
+
+The linear neurons are integrated by their closed form solution, and the
+nonlinear neurons by the exponential Euler method, the same as the default
+``exp_auto`` integrator: each variable is linearized around its current
+value, while the other variables are fixed at their current values.
+
+The parameters of a neuron group are packed into one ``[M, P]`` block (see
+:py:func:`pack_params`), where ``M`` is one when all parameters are homogeneous,
+and the number of neurons otherwise. One row holds all the parameters of one
+neuron, so that a kernel reads them in a single memory stream.
+"""
+
+import numpy as np
+
+from brainpy._src.dependency_check import import_numba
+
+numba = import_numba(error_if_not_found=False)
+
+__all__ = [
+  'numba',
+  'as_kernel_arg',
+  'pack_params',
+  'if_step',
+  'lif_step',
+  'lif_ref_step',
+  'lif_ref_counter_step',
+  'adex_step',
+  'adex_ref_step',
+  'quaif_step',
+  'adquaif_step',
+  'gif_step',
+]
+
+
+def as_kernel_arg(x, dtype):
+  """Convert a scalar or an array to a flat and contiguous NumPy array."""
+  return np.ascontiguousarray(np.asarray(x, dtype=dtype).reshape(-1))
+
+
+def pack_params(params, dtype):
+  """Pack the parameters into one contiguous ``[M, P]`` block.
+
+  Parameters
+  ----------
+  params: sequence of ArrayType, float
+    The ``P`` parameters, each being a scalar or an array.
+  dtype: dtype
+    The data type of the block.
+
+  Returns
+  -------
+  block: np.ndarray
+    The parameter block. ``M`` is one when all parameters have one element.
+  """
+  params = [as_kernel_arg(p, dtype) for p in params]
+  num = max(p.size for p in params)
+  return np.ascontiguousarray(np.stack([np.broadcast_to(p, (num,)) for p in params], axis=1))
+
+
+if numba is not None:
+  @numba.njit(inline='always')
+  def _get(p, i):
+    return p[0] if p.shape[0] == 1 else p[i]
+
+
+  @numba.njit(inline='always')
+  def _row(params, i):
+    return params[0] if params.shape[0] == 1 else params[i]
+
+
+  @numba.njit(inline='always')
+  def _exp_euler(x, dt, linear, derivative, threshold):
+    """The exponential Euler step, using the same ``exprel`` as ``brainpy.math.exprel``."""
+    z = dt * linear
+    if abs(z) <= threshold:
+      phi = 1. + z / 2. + z * z / 6.
+    else:
+      phi = (np.exp(z) - 1.) / z
+    return x + dt * phi * derivative
+
+
+  @numba.njit(fastmath={'contract'}, parallel=True, nogil=True)
+  def if_step(V, x, delta, params):
+    """``params`` columns: decay, V_rest, R."""
+    for i in numba.prange(V.shape[0]):
+      p = _row(params, i)
+      V_inf = p[1] + p[2] * _get(x, i)
+      V[i] = V_inf + (V[i] - V_inf) * p[0] + _get(delta, i)
+
+
+  @numba.njit(fastmath={'contract'}, parallel=True, nogil=True)
+  def lif_step(V, spike, x, delta, params):
+    """``params`` columns: decay, V_rest, R, V_reset, V_th."""
+    for i in numba.prange(V.shape[0]):
+      p = _row(params, i)
+      V_inf = p[1] + p[2] * _get(x, i)
+      v = V_inf + (V[i] - V_inf) * p[0] + _get(delta, i)
+      spike[i] = v >= p[4]
+      if spike[i]:
+        v += p[3] - v
+      V[i] = v
+
+
+  @numba.njit(fastmath={'contract'}, parallel=True, nogil=True)
+  def lif_ref_step(V, spike, refractory, t_last_spike, t, x, delta, params):
+    """``params`` columns: decay, V_rest, R, V_reset, V_th, tau_ref."""
+    for i in numba.prange(V.shape[0]):
+      p = _row(params, i)
+      ref = (t - t_last_spike[i]) <= p[5]
+      if ref:
+        # the integration of refractory neurons is skipped
+        v = V[i]
+      else:
+        V_inf = p[1] + p[2] * _get(x, i)
+        v = V_inf + (V[i] - V_inf) * p[0] + _get(delta, i)
+      spike[i] = v >= p[4]
+      if spike[i]:
+        v += p[3] - v
+        t_last_spike[i] = t
+      refractory[i] = ref or spike[i]
+      V[i] = v
+
+
+  @numba.njit(fastmath={'contract'}, parallel=True, nogil=True)
+  def lif_ref_counter_step(V, spike, refractory, steps_since_spike, ref_steps, max_steps, x, delta, params):
+    """Same as ``lif_ref_step``, but the refractory test is an integer comparison of
+    the ``int32`` steps elapsed since the last spike. ``params`` columns: decay,
+    V_rest, R, V_reset, V_th."""
+    for i in numba.prange(V.shape[0]):
+      p = _row(params, i)
+      steps = min(steps_since_spike[i] + 1, max_steps)
+      ref = steps <= _get(ref_steps, i)
+      if ref:
+        v = V[i]
+      else:
+        V_inf = p[1] + p[2] * _get(x, i)
+        v = V_inf + (V[i] - V_inf) * p[0] + _get(delta, i)
+      spike[i] = v >= p[4]
+      if spike[i]:
+        v += p[3] - v
+        steps = 0
+      refractory[i] = ref or spike[i]
+      steps_since_spike[i] = steps
+      V[i] = v
+
+
+  @numba.njit(fastmath={'contract'}, parallel=True, nogil=True)
+  def adex_step(V, w, spike, x, delta, dt, threshold, params):
+    """``params`` columns: V_rest, R, tau, V_T, delta_T, a, b, tau_w, V_reset, V_th."""
+    for i in numba.prange(V.shape[0]):
+      p = _row(params, i)
+      v, u = V[i], w[i]
+      e = np.exp((v - p[3]) / p[4])
+      dv = (p[0] - v + p[4] * e + p[1] * (_get(x, i) - u)) / p[2]
+      du = (p[5] * (v - p[0]) - u) / p[7]
+      v = _exp_euler(v, dt, (e - 1.) / p[2], dv, threshold) + _get(delta, i)
+      u = _exp_euler(u, dt, -1. / p[7], du, threshold)
+      spike[i] = v >= p[9]
+      if spike[i]:
+        v = p[8]
+        u += p[6]
+      V[i] = v
+      w[i] = u
+
+
+  @numba.njit(fastmath={'contract'}, parallel=True, nogil=True)
+  def adex_ref_step(V, w, spike, refractory, t_last_spike, t, x, delta, dt, threshold, params):
+    """Same as ``adex_step``, but the membrane potential of the refractory neurons is
+    not integrated. ``params`` columns: those of ``adex_step``, and tau_ref."""
+    for i in numba.prange(V.shape[0]):
+      p = _row(params, i)
+      v, u = V[i], w[i]
+      ref = (t - t_last_spike[i]) <= p[10]
+      du = (p[5] * (v - p[0]) - u) / p[7]
+      if not ref:
+        e = np.exp((v - p[3]) / p[4])
+        dv = (p[0] - v + p[4] * e + p[1] * (_get(x, i) - u)) / p[2]
+        v = _exp_euler(v, dt, (e - 1.) / p[2], dv, threshold) + _get(delta, i)
+      u = _exp_euler(u, dt, -1. / p[7], du, threshold)
+      spike[i] = v >= p[9]
+      if spike[i]:
+        v = p[8]
+        u += p[6]
+        t_last_spike[i] = t
+      refractory[i] = ref or spike[i]
+      V[i] = v
+      w[i] = u
+
+
+  @numba.njit(fastmath={'contract'}, parallel=True, nogil=True)
+  def quaif_step(V, spike, x, delta, dt, threshold, params):
+    """``params`` columns: V_rest, V_c, c, R, tau, V_reset, V_th."""
+    for i in numba.prange(V.shape[0]):
+      p = _row(params, i)
+      v = V[i]
+      dv = (p[2] * (v - p[0]) * (v - p[1]) + p[3] * _get(x, i)) / p[4]
+      v = _exp_euler(v, dt, p[2] * (2. * v - p[0] - p[1]) / p[4], dv, threshold) + _get(delta, i)
+      spike[i] = v >= p[6]
+      if spike[i]:
+        v = p[5]
+      V[i] = v
+
+
+  @numba.njit(fastmath={'contract'}, parallel=True, nogil=True)
+  def adquaif_step(V, w, spike, x, delta, dt, threshold, params):
+    """``params`` columns: V_rest, V_c, c, tau, a, b, tau_w, V_reset, V_th."""
+    for i in numba.prange(V.shape[0]):
+      p = _row(params, i)
+      v, u = V[i], w[i]
+      dv = (p[2] * (v - p[0]) * (v - p[1]) - u + _get(x, i)) / p[3]
+      du = (p[4] * (v - p[0]) - u) / p[6]
+      v = _exp_euler(v, dt, p[2] * (2. * v - p[0] - p[1]) / p[3], dv, threshold) + _get(delta, i)
+      u = _exp_euler(u, dt, -1. / p[6], du, threshold)
+      spike[i] = v >= p[8]
+      if spike[i]:
+        v = p[7]
+        u += p[5]
+      V[i] = v
+      w[i] = u
+
+
+  @numba.njit(fastmath={'contract'}, parallel=True, nogil=True)
+  def gif_step(V, V_th, I1, I2, spike, x, delta, factors, params):
+    """``factors`` columns: decay of I1, decay of I2, the exponential Euler factor of V_th.
+    ``params`` columns: decay, V_rest, R, a, b, V_th_inf, V_reset, V_th_reset, R1, A1, R2, A2."""
+    for i in numba.prange(V.shape[0]):
+      p = _row(params, i)
+      f = _row(factors, i)
+      v, th, i1, i2 = V[i], V_th[i], I1[i], I2[i]
+      V_inf = p[1] + p[2] * (_get(x, i) + i1 + i2)
+      new_v = V_inf + (v - V_inf) * p[0] + _get(delta, i)
+      new_th = th + f[2] * (p[3] * (v - p[1]) - p[4] * (th - p[5]))
+      i1 *= f[0]
+      i2 *= f[1]
+      # the spike is tested against the threshold before the update
+      spike[i] = new_v >= th
+      if spike[i]:
+        new_v = p[6]
+        i1 = p[8] * i1 + p[9]
+        i2 = p[10] * i2 + p[11]
+        new_th = max(p[7], new_th)
+      V[i], V_th[i], I1[i], I2[i] = new_v, new_th, i1, i2
+
+else:
+  if_step = lif_step = lif_ref_step = lif_ref_counter_step = None
+  adex_step = adex_ref_step = quaif_step = adquaif_step = gif_step = None
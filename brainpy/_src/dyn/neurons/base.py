@@ -1,8 +1,10 @@
 from typing import Sequence, Union, Callable, Any, Optional
 
 import brainpy.math as bm
+from brainpy._src.context import share
 from brainpy._src.dyn._docs import pneu_doc, dpneu_doc
 from brainpy._src.dyn.base import NeuDyn
+from brainpy._src.initialize.generic import _homogeneous_scalar
 from brainpy.check import is_callable
 
 __all__ = ['GradNeuDyn']
@@ -49,6 +51,40 @@ class GradNeuDyn(NeuDyn):
     else:
       self.scaling = scaling
 
+  def init_param(self, param, shape=None, sharding=None):
+    """Initialize parameters.
+
+    Homogeneous initializers, like ``Constant(10.)`` and ``ZeroInit()``, are kept
+    as Python scalars instead of being broadcast to arrays, so that the update
+    of neurons does not need to read a whole array for a uniform parameter.
+    Therefore, such parameters are floats rather than arrays of the shape ``varshape``.
+    Arrays, including zero-dimensional ones, are used as they are.
+    """
+    value = _homogeneous_scalar(param)
+    if value is not None:
+      return value
+    return super().init_param(param, shape=shape, sharding=sharding)
+
+  def run_steps(self, xs, t0=0., dt=None):
+    """Run the neuron over multiple time steps within one compiled loop.
+
+    Args:
+      xs: The external inputs, whose leading axis is the time axis.
+      t0: float. The time of the first step.
+      dt: float. The time step. Default is the global ``dt``.
+
+    Returns:
+      The spikes at all time steps.
+    """
+    dt = share.dt if dt is None else dt
+    indices = bm.arange(bm.shape(xs)[0])
+
+    def step(i, x):
+      share.save(i=i, t=t0 + i * dt, dt=dt)
+      return self.update(x)
+
+    return bm.for_loop(step, (indices, xs))
+
   @property
   def spk_dtype(self):
     if self._spk_dtype is None:
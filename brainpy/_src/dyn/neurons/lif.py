@@ -1,12 +1,19 @@
 from functools import partial
 from typing import Union, Callable, Optional, Any, Sequence
 
+import jax
+import jax.numpy as jnp
+import numpy as np
 from jax.lax import stop_gradient
 
 import brainpy.math as bm
 from brainpy._src.context import share
-from brainpy._src.dyn._docs import ref_doc, lif_doc, pneu_doc, dpneu_doc, ltc_doc, if_doc
+from brainpy._src.dyn._docs import (ref_doc, lif_doc, pneu_doc, dpneu_doc, ltc_doc, if_doc, ref_counter_doc,
+                                    spk_packed_doc, ref_spk_packed_doc, V_dtype_doc, adex_V_dtype_doc,
+                                    gif_V_dtype_doc, max_spikes_doc)
+from brainpy._src.dyn.neurons import _numba_lif
 from brainpy._src.dyn.neurons.base import GradNeuDyn
+from brainpy._src.dyn.utils import pack_spikes, spike_indices
 from brainpy._src.initialize import ZeroInit, OneInit, noise as init_noise
 from brainpy._src.integrators import odeint, sdeint, JointEq
 from brainpy.check import is_initializer
@@ -46,6 +53,375 @@ __all__ = [
 ]
 
 
+_EXP_EULER_METHODS = ('exp_auto', 'exp_euler', 'exp_euler_auto', 'exponential_euler')
+
+
+def _is_linear_derivative(neuron, name='derivative'):
+  """Whether the derivative ``name`` used by the neuron is declared as linear in ``V``."""
+  for cls in type(neuron).__mro__:
+    if name in cls.__dict__:
+      return cls.__dict__.get('_is_linear', False)
+  return False
+
+
+def _exp_euler_linear(V, V_rest, R, I, decay):
+  r"""Closed-form solution of :math:`\tau \frac{dV}{dt} = - (V - V_{rest}) + RI` over one step,
+  where ``decay`` is :math:`e^{-dt/\tau}`.
+
+  For this linear equation, the exponential Euler method is exact.
+  """
+  V_inf = V_rest + R * I
+  return V_inf + (V - V_inf) * decay
+
+
+def _cache_key(dt, *params):
+  """The key of the factors computed from the time step ``dt`` and the parameters
+  ``params``, or None if the factors can not be cached.
+
+  The key holds the data of the parameters, since the in-place update of an
+  :py:class:`~.Array` replaces its data, while the JAX arrays are immutable.
+  The factors are not cached for the mutable NumPy arrays and the tracers.
+  """
+  if not isinstance(dt, (int, float)):
+    return None
+  key = [dt]
+  for p in params:
+    p = p.value if isinstance(p, bm.Array) else p
+    if not (isinstance(p, (int, float)) or (isinstance(p, jax.Array) and not isinstance(p, jax.core.Tracer))):
+      return None
+    key.append(p)
+  return tuple(key)
+
+
+def _same_key(old, new):
+  return (old is not None and len(old) == len(new) and old[0] == new[0] and
+          all(a is b for a, b in zip(old[1:], new[1:])))
+
+
+def _membrane_decay(neuron, dt):
+  r"""Get the membrane decay factor :math:`e^{-dt/\tau}` of the neuron.
+
+  When ``dt`` and ``tau`` are constants (see :py:func:`_cache_key`), the factor
+  is computed once and cached on the neuron until one of them changes.
+  """
+  tau = neuron.tau
+  key = _cache_key(dt, tau)
+  if key is None:
+    return bm.exp(-dt / tau)
+  if not _same_key(neuron._decay_key, key):
+    with jax.ensure_compile_time_eval():
+      neuron._decay = bm.as_jax(bm.exp(-dt / tau))
+    neuron._decay_key = key
+  return neuron._decay
+
+
+def _gif_factors(neuron, dt):
+  r"""Get the decay factors :math:`e^{-k_1 dt}` and :math:`e^{-k_2 dt}` of the
+  internal currents of the GIF neuron, and the exponential Euler factor
+  :math:`dt \cdot \mathrm{exprel}(-b dt)` of its threshold, cached as
+  :py:func:`_membrane_decay`."""
+  k1, k2, b = neuron.k1, neuron.k2, neuron.b
+
+  def factors():
+    return bm.exp(-k1 * dt), bm.exp(-k2 * dt), dt * bm.exprel(-b * dt)
+
+  key = _cache_key(dt, k1, k2, b)
+  if key is None:
+    return factors()
+  if not _same_key(neuron._gif_key, key):
+    with jax.ensure_compile_time_eval():
+      neuron._gif_factors = tuple(bm.as_jax(f) for f in factors())
+    neuron._gif_key = key
+  return neuron._gif_factors
+
+
+def _fuse_groups(cls, groups):
+  """Fuse several groups of the neuron class ``cls`` into one group. The fused
+  parameters, states and constructor arguments are given by the class attributes
+  ``_fused_params`` and ``_fused_states``, and the method ``_fused_kwargs()``."""
+  groups = tuple(groups)
+  if len(groups) == 0:
+    raise ValueError('At least one group should be given.')
+  kwargs = groups[0]._fused_kwargs()
+  for g in groups:
+    if type(g) is not type(groups[0]):
+      raise TypeError(f'All groups should have the same type, but got {type(groups[0]).__name__} '
+                      f'and {type(g).__name__}.')
+    if not isinstance(g, cls):
+      raise TypeError(f'{cls.__name__}.fuse() does not support {type(g).__name__}.')
+    if len(g.varshape) != 1:
+      raise ValueError(f'Only one-dimensional groups can be fused, but {g.name} has the shape {g.varshape}.')
+    if g.noise is not None:
+      raise ValueError(f'Groups with noise can not be fused, but {g.name} has noise.')
+    if len(g.cur_inputs) or len(g.delta_inputs):
+      raise ValueError(f'Groups with registered inputs can not be fused, but {g.name} has '
+                       f'{list(g.cur_inputs) + list(g.delta_inputs)}.')
+    g_kwargs = g._fused_kwargs()
+    g_scaling = g_kwargs.pop('scaling')
+    for k, v in g_kwargs.items():
+      if not (v is kwargs[k] or v == kwargs[k]):
+        raise ValueError(f'All groups should have the same "{k}", but got {kwargs[k]} and {v}.')
+    if (g_scaling.scale, g_scaling.bias) != (kwargs['scaling'].scale, kwargs['scaling'].bias):
+      raise ValueError('All groups should have the same "scaling".')
+
+  sizes = [g.varshape[0] for g in groups]
+  fused = type(groups[0])(sum(sizes), init_var=False, **kwargs)
+  for name in fused._fused_params:
+    params = [jnp.broadcast_to(bm.as_jax(getattr(g, name)), g.varshape) for g in groups]
+    setattr(fused, name, jnp.concatenate(params))
+  fused.reset_state(fused.mode)
+  for name in fused._fused_states:
+    if hasattr(fused, name):
+      getattr(fused, name).value = jnp.concatenate([bm.as_jax(getattr(g, name)) for g in groups])
+  if getattr(fused, 'spk_packed', False):
+    fused.spike_bits.value = pack_spikes(fused.spike.value)
+
+  offsets = np.cumsum([0] + sizes)
+  views = [fused[int(start): int(end)] for start, end in zip(offsets[:-1], offsets[1:])]
+  return fused, views
+
+
+def _numba_params(neuron, dt, names, decay=True):
+  """Get the parameter block of the Numba kernels, whose columns are the membrane
+  decay factor (if ``decay``) followed by the parameters ``names``.
+
+  The block is cached on the neuron while ``dt`` and the data of the parameters
+  are unchanged (see :py:func:`_cache_key`).
+  """
+  params = [getattr(neuron, n) for n in names]
+  if decay:
+    params.insert(0, _membrane_decay(neuron, dt))
+  key = _cache_key(dt, *params)
+  if key is None:
+    return _numba_lif.pack_params(params, neuron.V.dtype)
+  if not _same_key(neuron._params_key, key):
+    neuron._params = _numba_lif.pack_params(params, neuron.V.dtype)
+    neuron._params_key = key
+  return neuron._params
+
+
+def _is_tracer(x):
+  return isinstance(x.value if isinstance(x, bm.Array) else x, jax.core.Tracer)
+
+
+def _eager_on_cpu(neuron, *args):
+  """Whether Numba is available, and all data, including the parameters of the
+  neuron, are concrete (i.e., not under any JAX transformation) non-batched
+  arrays on CPU.
+
+  The parameters are checked as the attributes of the neuron, since they are
+  traced when they are differentiated, e.g., by ``bm.grad(..., grad_vars=neuron.tau)``,
+  or when they are set to the arguments of a transformed function.
+  """
+  return (_numba_lif.numba is not None and
+          isinstance(neuron.mode, bm.NonBatchingMode) and
+          bm.get_platform() == 'cpu' and
+          not any(_is_tracer(a) for a in args) and
+          not any(_is_tracer(v) for v in vars(neuron).values()))
+
+
+def _use_numba(neuron, *args):
+  """Whether the linear neuron can be updated by the Numba kernels in ``_numba_lif``.
+
+  It requires the closed form integration, and all data being concrete on CPU.
+  """
+  return neuron._exact_integral and _eager_on_cpu(neuron, *args)
+
+
+def _plain_derivative(neuron, name, ltc_cls, cls):
+  """Whether the derivative ``name`` of the neuron is the one of ``cls``, or the
+  one of ``ltc_cls`` without any current input, so that a Numba kernel computes
+  the same equation."""
+  f = getattr(type(neuron), name)
+  return f is getattr(cls, name) or (f is getattr(ltc_cls, name) and len(neuron.cur_inputs) == 0)
+
+
+# The kernels below donate the buffers of the integrated state (e.g., "V"),
+# which are temporaries of "update", so that the reset is written in place
+# when the neurons are updated eagerly. Under an outer "jit" the donation has no effect.
+# The arrays of the state variables are never donated, since they can be
+# referenced elsewhere (e.g., by monitors).
+
+
+@partial(jax.jit, donate_argnums=0)
+def _spike_reset(V, V_th, V_reset):
+  """Threshold and reset the membrane potential in a single fused kernel."""
+  spike = V >= V_th
+  V += (V_reset - V) * spike.astype(V.dtype)
+  return V, spike
+
+
+@partial(jax.jit, donate_argnums=0)
+def _ref_spike_reset(V, V_old, t_last_spike, t, V_th, V_reset, tau_ref):
+  """Refractory masking, threshold, reset and spike timing in a single fused kernel.
+
+  Returns the new membrane potential, the spike, the refractory state
+  (including the neurons spiking at this step), and the last spike time.
+  """
+  refractory = (t - t_last_spike) <= tau_ref
+  V = jnp.where(refractory, V_old, V)
+  spike = V >= V_th
+  V += (V_reset - V) * spike.astype(V.dtype)
+  # "t_last_spike" keeps the select, since "t_last + (t - t_last) * spike"
+  # loses precision when "t_last" is the large initial value
+  t_last_spike = jnp.where(spike, t, t_last_spike)
+  return V, spike, jnp.logical_or(refractory, spike), t_last_spike
+
+
+@partial(jax.jit, donate_argnums=(0, 1))
+def _adapt_spike_reset(V, w, V_th, V_reset, b):
+  """Threshold, reset and spike-triggered adaptation in a single fused kernel."""
+  spike = V >= V_th
+  return jnp.where(spike, V_reset, V), jnp.where(spike, w + b, w), spike
+
+
+@partial(jax.jit, donate_argnums=(0, 1, 2, 3))
+def _gif_spike_reset(V, I1, I2, V_th, V_th_old, V_reset, V_th_reset, R1, A1, R2, A2):
+  """Threshold and reset of the generalized integrate-and-fire neurons in a single
+  fused kernel. The spike is tested against the threshold before the integration."""
+  spike = V_th_old <= V
+  return (jnp.where(spike, V_reset, V),
+          jnp.where(spike, R1 * I1 + A1, I1),
+          jnp.where(spike, R2 * I2 + A2, I2),
+          jnp.where(spike, jnp.maximum(V_th_reset, V_th), V_th),
+          spike)
+
+
+@partial(jax.jit, donate_argnums=(0, 1))
+def _adapt_ref_spike_reset(V, w, V_old, t_last_spike, t, V_th, V_reset, b, tau_ref):
+  """Refractory masking, then ``_adapt_spike_reset`` and spike timing in a single fused kernel."""
+  refractory = (t - t_last_spike) <= tau_ref
+  V, w, spike = _adapt_spike_reset(jnp.where(refractory, V_old, V), w, V_th, V_reset, b)
+  return V, w, spike, jnp.logical_or(refractory, spike), jnp.where(spike, t, t_last_spike)
+
+
+@partial(jax.jit, donate_argnums=(0, 1, 2, 3))
+def _gif_ref_spike_reset(V, I1, I2, V_th, V_old, V_th_old, t_last_spike, t, tau_ref,
+                         V_reset, V_th_reset, R1, A1, R2, A2):
+  """Refractory masking, then ``_gif_spike_reset`` and spike timing in a single fused kernel."""
+  refractory = (t - t_last_spike) <= tau_ref
+  V, I1, I2, V_th, spike = _gif_spike_reset(jnp.where(refractory, V_old, V), I1, I2, V_th, V_th_old,
+                                            V_reset, V_th_reset, R1, A1, R2, A2)
+  return V, I1, I2, V_th, spike, jnp.logical_or(refractory, spike), jnp.where(spike, t, t_last_spike)
+
+
+def _compose_affine(first, second):
+  """Compose two affine maps ``V -> a * V + b``, applying ``first`` and then ``second``."""
+  return second[0] * first[0], second[0] * first[1] + second[1]
+
+
+@jax.jit
+def _lif_parallel_steps(V0, xs, decay, V_rest, R, V_th, V_reset):
+  """Simulate the LIF neurons over all the time steps of ``xs`` by parallel scans.
+
+  With given spike times, every step is an affine map of the membrane potential
+  (the reset is the constant map to ``V_reset``), so that the trajectory is an
+  associative scan. The spike times are found by fixed-point iteration: the
+  trajectory of the current spike times gives new spike times by the threshold.
+  The steps before the first wrong spike of each neuron are exact, so that every
+  iteration fixes at least one more step, and the iteration stops after at most
+  one iteration more than the number of spikes.
+  """
+  a = jnp.broadcast_to(decay, xs.shape).astype(xs.dtype)
+  b = (1 - a) * (V_rest + R * xs)
+
+  def trajectory(spike):
+    A = jnp.where(spike, 0., a)
+    B = jnp.where(spike, V_reset, b)
+    A, B = jax.lax.associative_scan(_compose_affine, (A, B))
+    V = A * V0 + B
+    V_before = jnp.concatenate([jnp.expand_dims(V0, 0), V[:-1]])
+    return V, a * V_before + b >= V_th
+
+  def body(carry):
+    spike, _ = carry
+    _, new_spike = trajectory(spike)
+    return new_spike, jnp.any(new_spike != spike)
+
+  spike, _ = jax.lax.while_loop(lambda carry: carry[1], body, (jnp.zeros(xs.shape, dtype=bool), True))
+  V, _ = trajectory(spike)
+  return V[-1], spike
+
+
+def _qif_solution(u0, t, k, D):
+  """The solution :math:`u(t)` of :math:`du/dt = k (u^2 - D)` with :math:`u(0) = u_0`,
+  before it diverges."""
+  rho = jnp.sqrt(jnp.abs(D))
+  tan_sol = rho * jnp.tan(k * rho * t + jnp.arctan(u0 / rho))
+  q = (u0 - rho) / (u0 + rho) * jnp.exp(2 * rho * k * t)
+  tanh_sol = rho * (1 + q) / (1 - q)
+  rational_sol = u0 / (1 - k * u0 * t)
+  return jnp.where(D < 0, tan_sol, jnp.where(D > 0, tanh_sol, rational_sol))
+
+
+def _qif_time_to(u0, u1, k, D):
+  """The time for the solution of :math:`du/dt = k (u^2 - D)` to go from ``u0``
+  to ``u1``, which is infinite when ``u1`` is never reached."""
+  rho = jnp.sqrt(jnp.abs(D))
+  tan_time = (jnp.arctan(u1 / rho) - jnp.arctan(u0 / rho)) / (k * rho)
+  tanh_time = (jnp.log((u1 - rho) / (u1 + rho)) - jnp.log((u0 - rho) / (u0 + rho))) / (2 * rho * k)
+  tanh_time = jnp.where(u0 > rho, tanh_time, jnp.inf)
+  rational_time = jnp.where(u0 > 0, (1 / u0 - 1 / u1) / k, jnp.inf)
+  t = jnp.where(D < 0, tan_time, jnp.where(D > 0, tanh_time, rational_time))
+  return jnp.where(u0 >= u1, 0., t)
+
+
+@jax.jit
+def _qif_advance(V, duration, V_reset, V_th, m, k, D):
+  """Advance the QIF neurons by ``duration`` with the exact solution.
+
+  Under a constant input, the first spike comes after the time ``T1`` to reach
+  the threshold from ``V``, and the following spikes are periodic, with the
+  period ``P`` to reach the threshold from the reset.
+  """
+  u, u_th, u_reset = V - m, V_th - m, V_reset - m
+  first = _qif_time_to(u, u_th, k, D)
+  period = _qif_time_to(u_reset, u_th, k, D)
+  spiked = first <= duration
+  num = jnp.where(spiked, 1 + jnp.floor(jnp.where(jnp.isinf(period), 0., (duration - first) / period)), 0.)
+  rest = jnp.where(spiked, duration - first - (num - 1) * jnp.where(jnp.isinf(period), 0., period), duration)
+  V = m + _qif_solution(jnp.where(spiked, u_reset, u), rest, k, D)
+  return V, num.astype(jnp.int32), first
+
+
+# the step count of neurons which have never spiked
+_NO_SPIKE_STEPS = 2 ** 30
+
+
+def _ref_steps(tau_ref, dt):
+  """The refractory period in the unit of integration steps."""
+  return bm.as_jax(bm.floor(tau_ref / dt + 1e-6)).astype(jnp.int32)
+
+
+def _load_refractory(neuron, t, dt):
+  """The refractory states before the spike test, and the incremented step counter
+  when the spike timing is tracked by ``steps_since_spike``."""
+  if neuron.ref_counter:
+    steps_since_spike = bm.minimum(neuron.steps_since_spike.value + 1, _NO_SPIKE_STEPS)
+    return steps_since_spike <= _ref_steps(neuron.tau_ref, dt), steps_since_spike
+  return (t - neuron.t_last_spike) <= neuron.tau_ref, None
+
+
+def _store_spike_timing(neuron, spike, t, steps_since_spike):
+  if neuron.ref_counter:
+    neuron.steps_since_spike.value = bm.where(spike, 0, steps_since_spike)
+  else:
+    neuron.t_last_spike.value = bm.where(spike, t, neuron.t_last_spike.value)
+
+
+@partial(jax.jit, donate_argnums=0)
+def _ref_counter_spike_reset(V, V_old, steps_since_spike, ref_steps, V_th, V_reset):
+  """Same as ``_ref_spike_reset``, but the spike timing is tracked with an
+  ``int32`` counter of the steps elapsed since the last spike."""
+  steps_since_spike = jnp.minimum(steps_since_spike + 1, _NO_SPIKE_STEPS)
+  refractory = steps_since_spike <= ref_steps
+  V = jnp.where(refractory, V_old, V)
+  spike = V >= V_th
+  V += (V_reset - V) * spike.astype(V.dtype)
+  steps_since_spike = jnp.where(spike, 0, steps_since_spike)
+  return V, spike, jnp.logical_or(refractory, spike), steps_since_spike
+
+
 class IFLTC(GradNeuDyn):
   r"""Leaky Integrator Model %s.
 
@@ -113,6 +489,11 @@ class IFLTC(GradNeuDyn):
 
     # integral
     self.integral = odeint(method=method, f=self.derivative)
+    self._exact_integral = _is_linear_derivative(self) and method in _EXP_EULER_METHODS
+    self._decay_key = None
+    self._decay = None
+    self._params_key = None
+    self._params = None
 
     # variables
     if init_var:
@@ -126,13 +507,30 @@ class IFLTC(GradNeuDyn):
     self.V = self.offset_scaling(self.init_variable(self._V_initializer, batch_size))
     self.spike = self.init_variable(partial(bm.zeros, dtype=self.spk_dtype), batch_size)
 
+  def _integrate_V(self, V, t, I, dt):
+    """Integrate the membrane potential by one step, using the closed form
+    solution when the dynamics are linear."""
+    if self._exact_integral:
+      return _exp_euler_linear(V, self.V_rest, self.R, I, _membrane_decay(self, dt))
+    return self.integral(V, t, I, dt)
+
+  def _numba_update(self, x, dt):
+    arg = partial(_numba_lif.as_kernel_arg, dtype=self.V.dtype)
+    V = arg(self.V.value).copy()
+    _numba_lif.if_step(V, arg(x), arg(self.sum_delta_inputs()),
+                       _numba_params(self, dt, ('V_rest', 'R')))
+    self.V.value = V.reshape(self.V.shape)
+
   def update(self, x=None):
     t = share.load('t')
     dt = share.load('dt')
     x = 0. if x is None else x
 
     # integrate membrane potential
-    self.V.value = self.integral(self.V.value, t, x, dt) + self.sum_delta_inputs()
+    if _use_numba(self, self.V, x, t):
+      self._numba_update(x, dt)
+    else:
+      self.V.value = self._integrate_V(self.V.value, t, x, dt) + self.sum_delta_inputs()
 
     return self.V.value
 
@@ -141,6 +539,8 @@ class IFLTC(GradNeuDyn):
 
 
 class IF(IFLTC):
+  _is_linear = True
+
   def derivative(self, V, t, I):
     return (-V + self.V_rest + self.R * I) / self.tau
 
@@ -195,6 +595,9 @@ class LifLTC(GradNeuDyn):
     %s
     %s
     %s
+    %s
+    %s
+    %s
 
   """
 
@@ -223,6 +626,10 @@ class LifLTC(GradNeuDyn):
 
       # noise
       noise: Optional[Union[float, ArrayType, Callable]] = None,
+
+      spk_packed: bool = False,
+      V_dtype: Any = None,
+      max_spikes: Optional[int] = None,
   ):
     # initialization
     super().__init__(size=size,
@@ -246,6 +653,9 @@ class LifLTC(GradNeuDyn):
 
     # initializers
     self._V_initializer = is_initializer(V_initializer)
+    self.spk_packed = spk_packed
+    self.V_dtype = None if isinstance(self.mode, bm.TrainingMode) else V_dtype
+    self.max_spikes = max_spikes
 
     # noise
     self.noise = init_noise(noise, self.varshape)
@@ -255,6 +665,13 @@ class LifLTC(GradNeuDyn):
       self.integral = sdeint(method=self.method, f=self.derivative, g=self.noise)
     else:
       self.integral = odeint(method=method, f=self.derivative)
+    self._exact_integral = (_is_linear_derivative(self) and
+                            self.noise is None and
+                            method in _EXP_EULER_METHODS)
+    self._decay_key = None
+    self._decay = None
+    self._params_key = None
+    self._params = None
 
     # variables
     if init_var:
@@ -265,16 +682,54 @@ class LifLTC(GradNeuDyn):
     return (-V + self.V_rest + self.R * I) / self.tau
 
   def reset_state(self, batch_size=None, **kwargs):
-    self.V = self.offset_scaling(self.init_variable(self._V_initializer, batch_size))
+    V = self.offset_scaling(self.init_variable(self._V_initializer, batch_size))
+    if self.V_dtype is not None:
+      V = bm.Variable(V, dtype=self.V_dtype, axis_names=V.axis_names)
+    self.V = V
     self.spike = self.init_variable(partial(bm.zeros, dtype=self.spk_dtype), batch_size)
+    if self.spk_packed:
+      self.spike_bits = self.init_variable(lambda s: pack_spikes(bm.zeros(s, dtype=bool)), batch_size)
+
+  def _integrate_V(self, V, t, I, dt):
+    """Integrate the membrane potential by one step, using the closed form
+    solution when the dynamics are linear."""
+    if self._exact_integral:
+      return _exp_euler_linear(V, self.V_rest, self.R, I, _membrane_decay(self, dt))
+    return self.integral(V, t, I, dt)
+
+  def _load_V(self):
+    # the membrane potential in the computing precision
+    return self.V.value if self.V_dtype is None else self.V.value.astype(bm.float_)
+
+  def _store_V(self, V):
+    self.V.value = V if self.V_dtype is None else V.astype(self.V_dtype)
+
+  def _numba_applicable(self, x, t):
+    return (self.V_dtype is None and
+            not self.spk_packed and
+            self.max_spikes is None and
+            _use_numba(self, self.V, x, t))
+
+  def _numba_update(self, x, t, dt):
+    arg = partial(_numba_lif.as_kernel_arg, dtype=self.V.dtype)
+    V = arg(self.V.value).copy()
+    spike = np.zeros(V.shape, dtype=bool)
+    _numba_lif.lif_step(V, spike, arg(x), arg(self.sum_delta_inputs()),
+                        _numba_params(self, dt, ('V_rest', 'R', 'V_reset', 'V_th')))
+    self.V.value = V.reshape(self.V.shape)
+    self.spike.value = spike.reshape(self.spike.shape).astype(self.spike.dtype)
+    return self.spike.value
 
   def update(self, x=None):
     t = share.load('t')
     dt = share.load('dt')
     x = 0. if x is None else x
 
+    if self._numba_applicable(x, t):
+      return self._numba_update(x, t, dt)
+
     # integrate membrane potential
-    V = self.integral(self.V.value, t, x, dt) + self.sum_delta_inputs()
+    V = self._integrate_V(self._load_V(), t, x, dt) + self.sum_delta_inputs()
 
     # spike, spiking time, and membrane potential reset
     if isinstance(self.mode, bm.TrainingMode):
@@ -288,13 +743,66 @@ class LifLTC(GradNeuDyn):
         raise ValueError
 
     else:
-      spike = V >= self.V_th
-      V = bm.where(spike, self.V_reset, V)
+      V, spike = _spike_reset(bm.as_jax(V), bm.as_jax(self.V_th), bm.as_jax(self.V_reset))
 
-    self.V.value = V
+    self._store_V(V)
     self.spike.value = spike
+    if self.spk_packed:
+      self.spike_bits.value = pack_spikes(spike)
+    if self.max_spikes is not None:
+      return spike_indices(spike, self.max_spikes)
     return spike
 
+  def run_steps_parallel(self, xs, dt=None):
+    """Run the neuron over multiple time steps with parallel scans over time.
+
+    Between spikes, the membrane potential follows a linear recurrence, which
+    is computed by an associative scan in ``O(log T)`` depth rather than ``T``
+    sequential steps. The spike times are found iteratively, with one scan per
+    iteration and at most one iteration more than the number of spikes of the
+    busiest neuron. It is suited to long simulations with sparse spikes.
+
+    It requires the closed form integration (exponential Euler methods without
+    noise), the non-training mode, no refractory period, and no registered
+    current or delta input, i.e., all the inputs are given by ``xs``.
+
+    Args:
+      xs: The external inputs, whose leading axis is the time axis.
+      dt: float. The time step. Default is the global ``dt``.
+
+    Returns:
+      The spikes at all time steps.
+    """
+    if len(self.cur_inputs) or len(self.delta_inputs):
+      raise ValueError(f'{self.__class__.__name__}.run_steps_parallel() requires all inputs given by "xs", '
+                       f'but got the registered inputs {list(self.cur_inputs) + list(self.delta_inputs)}.')
+    if isinstance(self, LifRefLTC):
+      raise ValueError(f'{self.__class__.__name__}.run_steps_parallel() does not support the refractory period, '
+                       f'which breaks the linear recurrence.')
+    # without current inputs, the derivative of "LifLTC" is also linear
+    linear = self._exact_integral or (_plain_derivative(self, 'derivative', LifLTC, Lif) and
+                                      self.noise is None and
+                                      self.method in _EXP_EULER_METHODS)
+    if not linear:
+      raise ValueError(f'{self.__class__.__name__}.run_steps_parallel() requires the closed form '
+                       f'integration, i.e., an exponential Euler method without noise.')
+    if isinstance(self.mode, bm.TrainingMode):
+      raise ValueError(f'{self.__class__.__name__}.run_steps_parallel() does not support {bm.TrainingMode}.')
+    dt = share.dt if dt is None else dt
+    xs = bm.as_jax(xs).astype(bm.float_)
+    V, spikes = _lif_parallel_steps(bm.as_jax(self._load_V()),
+                                    jnp.broadcast_to(xs, xs.shape[:1] + self.V.shape),
+                                    bm.as_jax(_membrane_decay(self, dt)),
+                                    bm.as_jax(self.V_rest),
+                                    bm.as_jax(self.R),
+                                    bm.as_jax(self.V_th),
+                                    bm.as_jax(self.V_reset))
+    self._store_V(V)
+    self.spike.value = spikes[-1]
+    if self.spk_packed:
+      self.spike_bits.value = pack_spikes(spikes[-1])
+    return spikes
+
   def return_info(self):
     return self.spike
 
@@ -338,9 +846,14 @@ class Lif(LifLTC):
     %s
     %s
     %s
+    %s
+    %s
+    %s
 
   """
 
+  _is_linear = True
+
   def derivative(self, V, t, I):
     return (-V + self.V_rest + self.R * I) / self.tau
 
@@ -350,8 +863,8 @@ class Lif(LifLTC):
     return super().update(x)
 
 
-Lif.__doc__ = Lif.__doc__ % (lif_doc, pneu_doc, dpneu_doc)
-LifLTC.__doc__ = LifLTC.__doc__ % (lif_doc, pneu_doc, dpneu_doc)
+Lif.__doc__ = Lif.__doc__ % (lif_doc, pneu_doc, dpneu_doc, spk_packed_doc, V_dtype_doc, max_spikes_doc)
+LifLTC.__doc__ = LifLTC.__doc__ % (lif_doc, pneu_doc, dpneu_doc, spk_packed_doc, V_dtype_doc, max_spikes_doc)
 
 
 class LifRefLTC(LifLTC):
@@ -398,6 +911,10 @@ class LifRefLTC(LifLTC):
     %s
     %s
     %s
+    %s
+    %s
+    %s
+    %s
 
   """
 
@@ -427,9 +944,14 @@ class LifRefLTC(LifLTC):
       # new neuron parameter
       tau_ref: Union[float, ArrayType, Callable] = 0.,
       ref_var: bool = False,
+      ref_counter: bool = False,
 
       # noise
       noise: Optional[Union[float, ArrayType, Callable]] = None,
+
+      spk_packed: bool = False,
+      V_dtype: Any = None,
+      max_spikes: Optional[int] = None,
   ):
     # initialization
     super().__init__(
@@ -455,10 +977,14 @@ class LifRefLTC(LifLTC):
       V_initializer=V_initializer,
 
       noise=noise,
+      spk_packed=spk_packed,
+      V_dtype=V_dtype,
+      max_spikes=max_spikes,
     )
 
     # parameters
     self.ref_var = ref_var
+    self.ref_counter = ref_counter
     self.tau_ref = self.init_param(tau_ref)
 
     # variables
@@ -467,27 +993,64 @@ class LifRefLTC(LifLTC):
 
   def reset_state(self, batch_size=None, **kwargs):
     super().reset_state(batch_size, **kwargs)
-    self.t_last_spike = self.init_variable(bm.ones, batch_size)
-    self.t_last_spike.fill_(-1e7)
+    if self.ref_counter:
+      self.steps_since_spike = self.init_variable(
+        partial(bm.full, fill_value=_NO_SPIKE_STEPS, dtype=bm.int32), batch_size
+      )
+    else:
+      self.t_last_spike = self.init_variable(bm.ones, batch_size)
+      self.t_last_spike.fill_(-1e7)
     if self.ref_var:
       self.refractory = self.init_variable(partial(bm.zeros, dtype=bool), batch_size)
+      if self.spk_packed:
+        self.refractory_bits = self.init_variable(lambda s: pack_spikes(bm.zeros(s, dtype=bool)), batch_size)
+
+  def _numba_update(self, x, t, dt):
+    arg = partial(_numba_lif.as_kernel_arg, dtype=self.V.dtype)
+    V = arg(self.V.value).copy()
+    spike = np.zeros(V.shape, dtype=bool)
+    refractory = np.zeros(V.shape, dtype=bool)
+    if self.ref_counter:
+      steps_since_spike = _numba_lif.as_kernel_arg(self.steps_since_spike.value, np.int32).copy()
+      # same as "_ref_steps()", computed in the precision of the state
+      ftype = V.dtype.type
+      ref_steps = np.floor(arg(self.tau_ref) / ftype(dt) + ftype(1e-6)).astype(np.int32)
+      _numba_lif.lif_ref_counter_step(V, spike, refractory, steps_since_spike, ref_steps, _NO_SPIKE_STEPS,
+                                      arg(x), arg(self.sum_delta_inputs()),
+                                      _numba_params(self, dt, ('V_rest', 'R', 'V_reset', 'V_th')))
+      self.steps_since_spike.value = steps_since_spike.reshape(self.steps_since_spike.shape)
+    else:
+      t_last_spike = arg(self.t_last_spike.value).copy()
+      _numba_lif.lif_ref_step(V, spike, refractory, t_last_spike, V.dtype.type(t),
+                              arg(x), arg(self.sum_delta_inputs()),
+                              _numba_params(self, dt, ('V_rest', 'R', 'V_reset', 'V_th', 'tau_ref')))
+      self.t_last_spike.value = t_last_spike.reshape(self.t_last_spike.shape)
+    self.V.value = V.reshape(self.V.shape)
+    self.spike.value = spike.reshape(self.spike.shape).astype(self.spike.dtype)
+    if self.ref_var:
+      self.refractory.value = refractory.reshape(self.refractory.shape)
+    return self.spike.value
 
   def update(self, x=None):
     t = share.load('t')
     dt = share.load('dt')
     x = 0. if x is None else x
 
-    # integrate membrane potential
-    V = self.integral(self.V.value, t, x, dt) + self.sum_delta_inputs()
+    if self._numba_applicable(x, t):
+      return self._numba_update(x, t, dt)
 
-    # refractory
-    refractory = (t - self.t_last_spike) <= self.tau_ref
-    if isinstance(self.mode, bm.TrainingMode):
-      refractory = stop_gradient(refractory)
-    V = bm.where(refractory, self.V.value, V)
+    # integrate membrane potential
+    V_old = self._load_V()
+    V = self._integrate_V(V_old, t, x, dt) + self.sum_delta_inputs()
 
-    # spike, refractory, spiking time, and membrane potential reset
+    # refractory, spike, spiking time, and membrane potential reset
     if isinstance(self.mode, bm.TrainingMode):
+      if self.ref_counter:
+        steps_since_spike = bm.minimum(self.steps_since_spike.value + 1, _NO_SPIKE_STEPS)
+        refractory = steps_since_spike <= _ref_steps(self.tau_ref, dt)
+      else:
+        refractory = (t - self.t_last_spike) <= self.tau_ref
+      V = bm.where(refractory, V_old, V)
       spike = self.spk_fun(V - self.V_th)
       spike_no_grad = stop_gradient(spike) if self.detach_spk else spike
       if self.spk_reset == 'soft':
@@ -497,20 +1060,43 @@ class LifRefLTC(LifLTC):
       else:
         raise ValueError
       spike_ = spike_no_grad > 0.
-      # will be used in other place, like Delta Synapse, so stop its gradient
       if self.ref_var:
-        self.refractory.value = stop_gradient(bm.logical_or(refractory, spike_).value)
-      t_last_spike = stop_gradient(bm.where(spike_, t, self.t_last_spike.value))
+        self.refractory.value = bm.logical_or(refractory, spike_)
+      if self.ref_counter:
+        self.steps_since_spike.value = bm.where(spike_, 0, steps_since_spike)
+      else:
+        self.t_last_spike.value = bm.where(spike_, t, self.t_last_spike.value)
+
+    elif self.ref_counter:
+      V, spike, refractory, steps_since_spike = _ref_counter_spike_reset(bm.as_jax(V),
+                                                                         V_old,
+                                                                         self.steps_since_spike.value,
+                                                                         _ref_steps(self.tau_ref, dt),
+                                                                         bm.as_jax(self.V_th),
+                                                                         bm.as_jax(self.V_reset))
+      if self.ref_var:
+        self.refractory.value = refractory
+      self.steps_since_spike.value = steps_since_spike
 
     else:
-      spike = V >= self.V_th
-      V = bm.where(spike, self.V_reset, V)
+      V, spike, refractory, t_last_spike = _ref_spike_reset(bm.as_jax(V),
+                                                            V_old,
+                                                            self.t_last_spike.value,
+                                                            t,
+                                                            bm.as_jax(self.V_th),
+                                                            bm.as_jax(self.V_reset),
+                                                            bm.as_jax(self.tau_ref))
       if self.ref_var:
-        self.refractory.value = bm.logical_or(refractory, spike)
-      t_last_spike = bm.where(spike, t, self.t_last_spike.value)
-    self.V.value = V
+        self.refractory.value = refractory
+      self.t_last_spike.value = t_last_spike
+    self._store_V(V)
     self.spike.value = spike
-    self.t_last_spike.value = t_last_spike
+    if self.spk_packed:
+      self.spike_bits.value = pack_spikes(spike)
+      if self.ref_var:
+        self.refractory_bits.value = pack_spikes(self.refractory.value)
+    if self.max_spikes is not None:
+      return spike_indices(spike, self.max_spikes)
     return spike
 
 
@@ -561,6 +1147,8 @@ class LifRef(LifRefLTC):
 
   """
 
+  _is_linear = True
+
   def derivative(self, V, t, I):
     return (-V + self.V_rest + self.R * I) / self.tau
 
@@ -570,8 +1158,10 @@ class LifRef(LifRefLTC):
     return super().update(x)
 
 
-LifRef.__doc__ = LifRefLTC.__doc__ % (lif_doc, pneu_doc, dpneu_doc, ref_doc)
-LifRefLTC.__doc__ = LifRefLTC.__doc__ % (lif_doc, pneu_doc, dpneu_doc, ref_doc)
+LifRef.__doc__ = LifRefLTC.__doc__ % (lif_doc, pneu_doc, dpneu_doc, ref_doc, ref_counter_doc, ref_spk_packed_doc,
+                                      V_dtype_doc, max_spikes_doc)
+LifRefLTC.__doc__ = LifRefLTC.__doc__ % (lif_doc, pneu_doc, dpneu_doc, ref_doc, ref_counter_doc, ref_spk_packed_doc,
+                                         V_dtype_doc, max_spikes_doc)
 
 
 class ExpIFLTC(GradNeuDyn):
@@ -774,8 +1364,7 @@ class ExpIFLTC(GradNeuDyn):
         raise ValueError
 
     else:
-      spike = V >= self.V_th
-      V = bm.where(spike, self.V_reset, V)
+      V, spike = _spike_reset(bm.as_jax(V), bm.as_jax(self.V_th), bm.as_jax(self.V_reset))
 
     self.V.value = V
     self.spike.value = spike
@@ -1080,12 +1669,6 @@ class ExpIFRefLTC(ExpIFLTC):
     self.ref_var = ref_var
     self.tau_ref = self.init_param(tau_ref)
 
-    # initializers
-    self._V_initializer = is_initializer(V_initializer)
-
-    # integral
-    self.integral = odeint(method=method, f=self.derivative)
-
     # variables
     if init_var:
       self.reset_state(self.mode)
@@ -1105,14 +1688,10 @@ class ExpIFRefLTC(ExpIFLTC):
     # integrate membrane potential
     V = self.integral(self.V.value, t, x, dt) + self.sum_delta_inputs()
 
-    # refractory
-    refractory = (t - self.t_last_spike) <= self.tau_ref
-    if isinstance(self.mode, bm.TrainingMode):
-      refractory = stop_gradient(refractory)
-    V = bm.where(refractory, self.V.value, V)
-
-    # spike, refractory, spiking time, and membrane potential reset
+    # refractory, spike, spiking time, and membrane potential reset
     if isinstance(self.mode, bm.TrainingMode):
+      refractory = (t - self.t_last_spike) <= self.tau_ref
+      V = bm.where(refractory, self.V.value, V)
       spike = self.spk_fun(V - self.V_th)
       spike_no_grad = stop_gradient(spike) if self.detach_spk else spike
       if self.spk_reset == 'soft':
@@ -1122,17 +1701,20 @@ class ExpIFRefLTC(ExpIFLTC):
       else:
         raise ValueError
       spike_ = spike_no_grad > 0.
-      # will be used in other place, like Delta Synapse, so stop its gradient
       if self.ref_var:
-        self.refractory.value = stop_gradient(bm.logical_or(refractory, spike_).value)
-      t_last_spike = stop_gradient(bm.where(spike_, t, self.t_last_spike.value))
+        self.refractory.value = bm.logical_or(refractory, spike_)
+      t_last_spike = bm.where(spike_, t, self.t_last_spike.value)
 
     else:
-      spike = V >= self.V_th
-      V = bm.where(spike, self.V_reset, V)
+      V, spike, refractory, t_last_spike = _ref_spike_reset(bm.as_jax(V),
+                                                            self.V.value,
+                                                            self.t_last_spike.value,
+                                                            t,
+                                                            bm.as_jax(self.V_th),
+                                                            bm.as_jax(self.V_reset),
+                                                            bm.as_jax(self.tau_ref))
       if self.ref_var:
-        self.refractory.value = bm.logical_or(refractory, spike)
-      t_last_spike = bm.where(spike, t, self.t_last_spike.value)
+        self.refractory.value = refractory
     self.V.value = V
     self.spike.value = spike
     self.t_last_spike.value = t_last_spike
@@ -1361,6 +1943,11 @@ class AdExIFLTC(GradNeuDyn):
 
 
 
+  Args:
+    %s
+    %s
+    %s
+    %s
   """
 
   def __init__(
@@ -1394,6 +1981,9 @@ class AdExIFLTC(GradNeuDyn):
 
       # noise
       noise: Union[float, ArrayType, Callable] = None,
+
+      spk_packed: bool = False,
+      V_dtype: Any = None,
   ):
     # initialization
     super().__init__(size=size,
@@ -1422,6 +2012,8 @@ class AdExIFLTC(GradNeuDyn):
     # initializers
     self._V_initializer = is_initializer(V_initializer)
     self._w_initializer = is_initializer(w_initializer)
+    self.spk_packed = spk_packed
+    self.V_dtype = None if isinstance(self.mode, bm.TrainingMode) else V_dtype
 
     # integral
     self.noise = init_noise(noise, self.varshape, num_vars=2)
@@ -1429,6 +2021,9 @@ class AdExIFLTC(GradNeuDyn):
       self.integral = sdeint(method=self.method, f=self.derivative, g=self.noise)
     else:
       self.integral = odeint(method=method, f=self.derivative)
+    self._numba_integral = self.noise is None and method in _EXP_EULER_METHODS
+    self._params_key = None
+    self._params = None
 
     # variables
     if init_var:
@@ -1437,7 +2032,7 @@ class AdExIFLTC(GradNeuDyn):
   def dV(self, V, t, w, I):
     I = self.sum_current_inputs(V, init=I)
     exp = self.delta_T * bm.exp((V - self.V_T) / self.delta_T)
-    dVdt = (- V + self.V_rest + exp - self.R * w + self.R * I) / self.tau
+    dVdt = (- V + self.V_rest + exp + self.R * (I - w)) / self.tau
     return dVdt
 
   def dw(self, w, t, V):
@@ -1449,17 +2044,57 @@ class AdExIFLTC(GradNeuDyn):
     return JointEq([self.dV, self.dw])
 
   def reset_state(self, batch_size=None, **kwargs):
-    self.V = self.offset_scaling(self.init_variable(self._V_initializer, batch_size))
-    self.w = self.std_scaling(self.init_variable(self._w_initializer, batch_size))
+    V = self.offset_scaling(self.init_variable(self._V_initializer, batch_size))
+    w = self.std_scaling(self.init_variable(self._w_initializer, batch_size))
+    if self.V_dtype is not None:
+      V = bm.Variable(V, dtype=self.V_dtype, axis_names=V.axis_names)
+      w = bm.Variable(w, dtype=self.V_dtype, axis_names=w.axis_names)
+    self.V = V
+    self.w = w
     self.spike = self.init_variable(partial(bm.zeros, dtype=self.spk_dtype), batch_size)
+    if self.spk_packed:
+      self.spike_bits = self.init_variable(lambda s: pack_spikes(bm.zeros(s, dtype=bool)), batch_size)
+
+  def _load_state(self, var):
+    # the state in the computing precision
+    return var.value if self.V_dtype is None else var.value.astype(bm.float_)
+
+  def _store_state(self, var, value):
+    var.value = value if self.V_dtype is None else value.astype(self.V_dtype)
+
+  _numba_columns = ('V_rest', 'R', 'tau', 'V_T', 'delta_T', 'a', 'b', 'tau_w', 'V_reset', 'V_th')
+
+  def _numba_applicable(self, x, t):
+    return (self._numba_integral and
+            self.V_dtype is None and
+            not self.spk_packed and
+            _plain_derivative(self, 'dV', AdExIFLTC, AdExIF) and
+            _plain_derivative(self, 'dw', AdExIFLTC, AdExIFLTC) and
+            _eager_on_cpu(self, self.V, x, t))
+
+  def _numba_update(self, x, t, dt):
+    arg = partial(_numba_lif.as_kernel_arg, dtype=self.V.dtype)
+    V = arg(self.V.value).copy()
+    w = arg(self.w.value).copy()
+    spike = np.zeros(V.shape, dtype=bool)
+    threshold = 1e-8 if V.dtype == np.float64 else 1e-5
+    params = _numba_params(self, dt, self._numba_columns, decay=False)
+    _numba_lif.adex_step(V, w, spike, arg(x), arg(self.sum_delta_inputs()), V.dtype.type(dt), threshold, params)
+    self.V.value = V.reshape(self.V.shape)
+    self.w.value = w.reshape(self.w.shape)
+    self.spike.value = spike.reshape(self.spike.shape).astype(self.spike.dtype)
+    return self.spike.value
 
   def update(self, x=None):
     t = share.load('t')
     dt = share.load('dt')
     x = 0. if x is None else x
 
+    if self._numba_applicable(x, t):
+      return self._numba_update(x, t, dt)
+
     # integrate membrane potential
-    V, w = self.integral(self.V.value, self.w.value, t, x, dt)
+    V, w = self.integral(self._load_state(self.V), self._load_state(self.w), t, x, dt)
     V += self.sum_delta_inputs()
 
     # spike, spiking time, and membrane potential reset
@@ -1475,18 +2110,46 @@ class AdExIFLTC(GradNeuDyn):
       w += self.b * spike
 
     else:
-      spike = V >= self.V_th
-      V = bm.where(spike, self.V_reset, V)
-      w = bm.where(spike, w + self.b, w)
+      V, w, spike = _adapt_spike_reset(bm.as_jax(V), bm.as_jax(w), bm.as_jax(self.V_th),
+                                       bm.as_jax(self.V_reset), bm.as_jax(self.b))
 
-    self.V.value = V
-    self.w.value = w
+    self._store_state(self.V, V)
+    self._store_state(self.w, w)
     self.spike.value = spike
+    if self.spk_packed:
+      self.spike_bits.value = pack_spikes(spike)
     return spike
 
   def return_info(self):
     return self.spike
 
+  _fused_params = ('V_rest', 'V_reset', 'V_th', 'V_T', 'delta_T', 'a', 'b', 'R', 'tau', 'tau_w')
+  _fused_states = ('V', 'w', 'spike')
+
+  def _fused_kwargs(self):
+    return dict(mode=self.mode, method=self.method, scaling=self.scaling, spk_fun=self.spk_fun,
+                spk_dtype=self._spk_dtype, spk_reset=self.spk_reset, detach_spk=self.detach_spk,
+                spk_packed=self.spk_packed, V_dtype=self.V_dtype)
+
+  @classmethod
+  def fuse(cls, groups: Sequence['AdExIFLTC']):
+    """Fuse several groups of the same neuron type into one group.
+
+    Each group runs its own ``update()``, which costs one pass of small operations per
+    group. The fused group stacks the states and the parameters of all groups along
+    the neuron axis, so that one ``update()`` integrates all of them. The parameters
+    may differ across the groups. The states of the fused group are copied from the
+    current states of the groups.
+
+    Args:
+      groups: The one-dimensional neuron groups. They should have the same type and the
+        same configuration except the parameters, and should not have registered inputs.
+
+    Returns:
+      The fused group, and the views of the fused group corresponding to each given group.
+    """
+    return _fuse_groups(cls, groups)
+
 
 class AdExIF(AdExIFLTC):
   r"""Adaptive exponential integrate-and-fire neuron model.
@@ -1586,16 +2249,18 @@ class AdExIF(AdExIFLTC):
   Args:
     %s
     %s
+    %s
+    %s
   """
 
   def dV(self, V, t, w, I):
     exp = self.delta_T * bm.exp((V - self.V_T) / self.delta_T)
-    dVdt = (- V + self.V_rest + exp - self.R * w + self.R * I) / self.tau
+    dVdt = (- V + self.V_rest + exp + self.R * (I - w)) / self.tau
     return dVdt
 
   def update(self, x=None):
     x = 0. if x is None else x
-    x = self.sum_current_inputs(self.V.value, init=x)
+    x = self.sum_current_inputs(self._load_state(self.V), init=x)
     return super().update(x)
 
 
@@ -1699,6 +2364,9 @@ class AdExIFRefLTC(AdExIFLTC):
     %s
     %s
     %s
+    %s
+    %s
+    %s
   """
 
   def __init__(
@@ -1733,9 +2401,13 @@ class AdExIFRefLTC(AdExIFLTC):
       # new neuron parameter
       tau_ref: Union[float, ArrayType, Callable] = 0.,
       ref_var: bool = False,
+      ref_counter: bool = False,
 
       # noise
       noise: Union[float, ArrayType, Callable] = None,
+
+      spk_packed: bool = False,
+      V_dtype: Any = None,
   ):
     # initialization
     super().__init__(
@@ -1764,49 +2436,85 @@ class AdExIFRefLTC(AdExIFLTC):
       tau=tau,
       tau_w=tau_w,
       V_initializer=V_initializer,
-      w_initializer=w_initializer
+      w_initializer=w_initializer,
+      noise=noise,
+      spk_packed=spk_packed,
+      V_dtype=V_dtype,
     )
 
     # parameters
     self.ref_var = ref_var
+    self.ref_counter = ref_counter
     self.tau_ref = self.init_param(tau_ref)
 
-    # initializers
-    self._V_initializer = is_initializer(V_initializer)
-    self._w_initializer = is_initializer(w_initializer)
-
-    # integral
-    self.noise = init_noise(noise, self.varshape, num_vars=2)
-    if self.noise is not None:
-      self.integral = sdeint(method=self.method, f=self.derivative, g=self.noise)
-    else:
-      self.integral = odeint(method=method, f=self.derivative)
-
     # variables
     if init_var:
       self.reset_state(self.mode)
 
   def reset_state(self, batch_size=None, **kwargs):
     super().reset_state(batch_size, **kwargs)
-    self.t_last_spike = self.init_variable(bm.ones, batch_size)
-    self.t_last_spike.fill_(-1e8)
+    if self.ref_counter:
+      self.steps_since_spike = self.init_variable(
+        partial(bm.full, fill_value=_NO_SPIKE_STEPS, dtype=bm.int32), batch_size
+      )
+    else:
+      self.t_last_spike = self.init_variable(bm.ones, batch_size)
+      self.t_last_spike.fill_(-1e8)
     if self.ref_var:
       self.refractory = self.init_variable(partial(bm.zeros, dtype=bool), batch_size)
 
+  _fused_params = AdExIFLTC._fused_params + ('tau_ref',)
+  _fused_states = AdExIFLTC._fused_states + ('t_last_spike', 'steps_since_spike', 'refractory')
+
+  def _fused_kwargs(self):
+    return dict(super()._fused_kwargs(), ref_var=self.ref_var, ref_counter=self.ref_counter)
+
+  _numba_columns = AdExIFLTC._numba_columns + ('tau_ref',)
+
+  def _numba_applicable(self, x, t):
+    return (self._numba_integral and
+            self.V_dtype is None and
+            not self.spk_packed and
+            not self.ref_counter and
+            _plain_derivative(self, 'dV', AdExIFLTC, AdExIFRef) and
+            _plain_derivative(self, 'dw', AdExIFLTC, AdExIFLTC) and
+            _eager_on_cpu(self, self.V, x, t))
+
+  def _numba_update(self, x, t, dt):
+    arg = partial(_numba_lif.as_kernel_arg, dtype=self.V.dtype)
+    V = arg(self.V.value).copy()
+    w = arg(self.w.value).copy()
+    t_last_spike = arg(self.t_last_spike.value).copy()
+    spike = np.zeros(V.shape, dtype=bool)
+    refractory = np.zeros(V.shape, dtype=bool)
+    threshold = 1e-8 if V.dtype == np.float64 else 1e-5
+    _numba_lif.adex_ref_step(V, w, spike, refractory, t_last_spike, V.dtype.type(t), arg(x),
+                             arg(self.sum_delta_inputs()), V.dtype.type(dt), threshold,
+                             _numba_params(self, dt, self._numba_columns, decay=False))
+    self.V.value = V.reshape(self.V.shape)
+    self.w.value = w.reshape(self.w.shape)
+    self.t_last_spike.value = t_last_spike.reshape(self.t_last_spike.shape)
+    self.spike.value = spike.reshape(self.spike.shape).astype(self.spike.dtype)
+    if self.ref_var:
+      self.refractory.value = refractory.reshape(self.refractory.shape)
+    return self.spike.value
+
   def update(self, x=None):
     t = share.load('t')
     dt = share.load('dt')
     x = 0. if x is None else x
 
+    if self._numba_applicable(x, t):
+      return self._numba_update(x, t, dt)
+
     # integrate membrane potential
-    V, w = self.integral(self.V.value, self.w.value, t, x, dt)
+    V_old = self._load_state(self.V)
+    V, w = self.integral(V_old, self._load_state(self.w), t, x, dt)
     V += self.sum_delta_inputs()
 
     # refractory
-    refractory = (t - self.t_last_spike) <= self.tau_ref
-    if isinstance(self.mode, bm.TrainingMode):
-      refractory = stop_gradient(refractory)
-    V = bm.where(refractory, self.V.value, V)
+    refractory, steps_since_spike = _load_refractory(self, t, dt)
+    V = bm.where(refractory, V_old, V)
 
     # spike, refractory, spiking time, and membrane potential reset
     if isinstance(self.mode, bm.TrainingMode):
@@ -1820,22 +2528,21 @@ class AdExIFRefLTC(AdExIFLTC):
         raise ValueError
       w += self.b * spike_no_grad
       spike_ = spike_no_grad > 0.
-      # will be used in other place, like Delta Synapse, so stop its gradient
       if self.ref_var:
-        self.refractory.value = stop_gradient(bm.logical_or(refractory, spike_).value)
-      t_last_spike = stop_gradient(bm.where(spike_, t, self.t_last_spike.value))
+        self.refractory.value = bm.logical_or(refractory, spike_)
+      _store_spike_timing(self, spike_, t, steps_since_spike)
 
     else:
-      spike = V >= self.V_th
-      V = bm.where(spike, self.V_reset, V)
-      w = bm.where(spike, w + self.b, w)
+      V, w, spike = _adapt_spike_reset(bm.as_jax(V), bm.as_jax(w), bm.as_jax(self.V_th),
+                                       bm.as_jax(self.V_reset), bm.as_jax(self.b))
       if self.ref_var:
         self.refractory.value = bm.logical_or(refractory, spike)
-      t_last_spike = bm.where(spike, t, self.t_last_spike.value)
-    self.V.value = V
-    self.w.value = w
+      _store_spike_timing(self, spike, t, steps_since_spike)
+    self._store_state(self.V, V)
+    self._store_state(self.w, w)
     self.spike.value = spike
-    self.t_last_spike.value = t_last_spike
+    if self.spk_packed:
+      self.spike_bits.value = pack_spikes(spike)
     return spike
 
 
@@ -1936,23 +2643,28 @@ class AdExIFRef(AdExIFRefLTC):
     %s
     %s
     %s
+    %s
+    %s
+    %s
   """
 
   def dV(self, V, t, w, I):
     exp = self.delta_T * bm.exp((V - self.V_T) / self.delta_T)
-    dVdt = (- V + self.V_rest + exp - self.R * w + self.R * I) / self.tau
+    dVdt = (- V + self.V_rest + exp + self.R * (I - w)) / self.tau
     return dVdt
 
   def update(self, x=None):
     x = 0. if x is None else x
-    x = self.sum_current_inputs(self.V.value, init=x)
+    x = self.sum_current_inputs(self._load_state(self.V), init=x)
     return super().update(x)
 
 
-AdExIF.__doc__ = AdExIF.__doc__ % (pneu_doc, dpneu_doc)
-AdExIFRefLTC.__doc__ = AdExIFRefLTC.__doc__ % (pneu_doc, dpneu_doc, ref_doc)
-AdExIFRef.__doc__ = AdExIFRef.__doc__ % (pneu_doc, dpneu_doc, ref_doc)
-AdExIFLTC.__doc__ = AdExIFLTC.__doc__ % ()
+AdExIF.__doc__ = AdExIF.__doc__ % (pneu_doc, dpneu_doc, spk_packed_doc, adex_V_dtype_doc)
+AdExIFRefLTC.__doc__ = AdExIFRefLTC.__doc__ % (pneu_doc, dpneu_doc, ref_doc, ref_counter_doc, spk_packed_doc,
+                                               adex_V_dtype_doc)
+AdExIFRef.__doc__ = AdExIFRef.__doc__ % (pneu_doc, dpneu_doc, ref_doc, ref_counter_doc, spk_packed_doc,
+                                         adex_V_dtype_doc)
+AdExIFLTC.__doc__ = AdExIFLTC.__doc__ % (pneu_doc, dpneu_doc, spk_packed_doc, adex_V_dtype_doc)
 
 
 class QuaIFLTC(GradNeuDyn):
@@ -2085,6 +2797,9 @@ class QuaIFLTC(GradNeuDyn):
       self.integral = sdeint(method=self.method, f=self.derivative, g=self.noise)
     else:
       self.integral = odeint(method=method, f=self.derivative)
+    self._numba_integral = self.noise is None and method in _EXP_EULER_METHODS
+    self._params_key = None
+    self._params = None
 
     # variables
     if init_var:
@@ -2099,11 +2814,30 @@ class QuaIFLTC(GradNeuDyn):
     self.V = self.offset_scaling(self.init_variable(self._V_initializer, batch_size))
     self.spike = self.init_variable(partial(bm.zeros, dtype=self.spk_dtype), batch_size)
 
+  def _numba_applicable(self, x, t):
+    return (self._numba_integral and
+            _plain_derivative(self, 'derivative', QuaIFLTC, QuaIF) and
+            _eager_on_cpu(self, self.V, x, t))
+
+  def _numba_update(self, x, dt):
+    arg = partial(_numba_lif.as_kernel_arg, dtype=self.V.dtype)
+    V = arg(self.V.value).copy()
+    spike = np.zeros(V.shape, dtype=bool)
+    threshold = 1e-8 if V.dtype == np.float64 else 1e-5
+    params = _numba_params(self, dt, ('V_rest', 'V_c', 'c', 'R', 'tau', 'V_reset', 'V_th'), decay=False)
+    _numba_lif.quaif_step(V, spike, arg(x), arg(self.sum_delta_inputs()), V.dtype.type(dt), threshold, params)
+    self.V.value = V.reshape(self.V.shape)
+    self.spike.value = spike.reshape(self.spike.shape).astype(self.spike.dtype)
+    return self.spike.value
+
   def update(self, x=None):
     t = share.load('t')
     dt = share.load('dt')
     x = 0. if x is None else x
 
+    if self._numba_applicable(x, t):
+      return self._numba_update(x, dt)
+
     # integrate membrane potential
     V = self.integral(self.V.value, t, x, dt) + self.sum_delta_inputs()
 
@@ -2119,13 +2853,65 @@ class QuaIFLTC(GradNeuDyn):
         raise ValueError
 
     else:
-      spike = V >= self.V_th
-      V = bm.where(spike, self.V_reset, V)
+      V, spike = _spike_reset(bm.as_jax(V), bm.as_jax(self.V_th), bm.as_jax(self.V_reset))
 
     self.V.value = V
     self.spike.value = spike
     return spike
 
+  def _qif_coefficients(self, x):
+    # the equation is written as du/dt = k (u^2 - D), where u = V - m
+    if len(self.cur_inputs) or len(self.delta_inputs):
+      raise ValueError(f'{self.__class__.__name__} requires all inputs given by "x" for the exact solution, '
+                       f'but got the registered inputs {list(self.cur_inputs) + list(self.delta_inputs)}.')
+    if isinstance(self, QuaIFRefLTC):
+      raise ValueError(f'{self.__class__.__name__} does not support the exact solution, '
+                       f'since it does not include the refractory period.')
+    x = 0. if x is None else x
+    m = (self.V_rest + self.V_c) / 2
+    k = self.c / self.tau
+    D = ((self.V_c - self.V_rest) / 2) ** 2 - self.R * x / self.c
+    return bm.as_jax(m), bm.as_jax(k), bm.as_jax(D)
+
+  def time_to_spike(self, x=None):
+    """The time for each neuron to reach the threshold under the constant input ``x``.
+
+    It is computed with the exact solution of the model equation, which has a
+    closed form for a constant input. It is infinite for the neurons which do
+    not spike, i.e., which converge to a stable fixed point.
+
+    Args:
+      x: The constant external input.
+
+    Returns:
+      The time to the next spike.
+    """
+    m, k, D = self._qif_coefficients(x)
+    V = bm.as_jax(self.V.value)
+    return _qif_time_to(V - m, bm.as_jax(self.V_th) - m, k, D)
+
+  def advance(self, duration, x=None):
+    """Advance the neurons by ``duration`` under the constant input ``x``, in an
+    event-driven way rather than by time steps.
+
+    The spike times are solved with the exact solution of the model equation,
+    so that the cost does not depend on ``duration`` or the time step. The
+    result is the limit of the step-by-step simulation as ``dt`` goes to zero.
+
+    Args:
+      duration: float. The time to advance.
+      x: The constant external input.
+
+    Returns:
+      A tuple of the number of spikes of each neuron, and the time of the first
+      spike since the start (larger than ``duration`` if there is no spike).
+    """
+    m, k, D = self._qif_coefficients(x)
+    V, num, first = _qif_advance(bm.as_jax(self.V.value), duration, bm.as_jax(self.V_reset),
+                                 bm.as_jax(self.V_th), m, k, D)
+    self.V.value = V
+    return num, first
+
   def return_info(self):
     return self.spike
 
@@ -2297,6 +3083,7 @@ class QuaIFRefLTC(QuaIFLTC):
     %s
     %s
     %s
+    %s
   """
 
   def __init__(
@@ -2327,6 +3114,7 @@ class QuaIFRefLTC(QuaIFLTC):
       # new neuron parameter
       tau_ref: Union[float, ArrayType, Callable] = 0.,
       ref_var: bool = False,
+      ref_counter: bool = False,
 
       # noise
       noise: Union[float, ArrayType, Callable] = None,
@@ -2355,30 +3143,27 @@ class QuaIFRefLTC(QuaIFLTC):
       R=R,
       tau=tau,
       V_initializer=V_initializer,
+      noise=noise,
     )
 
     # parameters
     self.ref_var = ref_var
+    self.ref_counter = ref_counter
     self.tau_ref = self.init_param(tau_ref)
 
-    # initializers
-    self._V_initializer = is_initializer(V_initializer)
-
-    # integral
-    self.noise = init_noise(noise, self.varshape, num_vars=1)
-    if self.noise is not None:
-      self.integral = sdeint(method=self.method, f=self.derivative, g=self.noise)
-    else:
-      self.integral = odeint(method=method, f=self.derivative)
-
     # variables
     if init_var:
       self.reset_state(self.mode)
 
   def reset_state(self, batch_size=None, **kwargs):
     super().reset_state(batch_size, **kwargs)
-    self.t_last_spike = self.init_variable(bm.ones, batch_size)
-    self.t_last_spike.fill_(-1e7)
+    if self.ref_counter:
+      self.steps_since_spike = self.init_variable(
+        partial(bm.full, fill_value=_NO_SPIKE_STEPS, dtype=bm.int32), batch_size
+      )
+    else:
+      self.t_last_spike = self.init_variable(bm.ones, batch_size)
+      self.t_last_spike.fill_(-1e7)
     if self.ref_var:
       self.refractory = self.init_variable(partial(bm.zeros, dtype=bool), batch_size)
 
@@ -2391,9 +3176,7 @@ class QuaIFRefLTC(QuaIFLTC):
     V = self.integral(self.V.value, t, x, dt) + self.sum_delta_inputs()
 
     # refractory
-    refractory = (t - self.t_last_spike) <= self.tau_ref
-    if isinstance(self.mode, bm.TrainingMode):
-      refractory = stop_gradient(refractory)
+    refractory, steps_since_spike = _load_refractory(self, t, dt)
     V = bm.where(refractory, self.V.value, V)
 
     # spike, refractory, spiking time, and membrane potential reset
@@ -2407,20 +3190,17 @@ class QuaIFRefLTC(QuaIFLTC):
       else:
         raise ValueError
       spike_ = spike_no_grad > 0.
-      # will be used in other place, like Delta Synapse, so stop its gradient
       if self.ref_var:
-        self.refractory.value = stop_gradient(bm.logical_or(refractory, spike_).value)
-      t_last_spike = stop_gradient(bm.where(spike_, t, self.t_last_spike.value))
+        self.refractory.value = bm.logical_or(refractory, spike_)
+      _store_spike_timing(self, spike_, t, steps_since_spike)
 
     else:
-      spike = V >= self.V_th
-      V = bm.where(spike, self.V_reset, V)
+      V, spike = _spike_reset(bm.as_jax(V), bm.as_jax(self.V_th), bm.as_jax(self.V_reset))
       if self.ref_var:
         self.refractory.value = bm.logical_or(refractory, spike)
-      t_last_spike = bm.where(spike, t, self.t_last_spike.value)
+      _store_spike_timing(self, spike, t, steps_since_spike)
     self.V.value = V
     self.spike.value = spike
-    self.t_last_spike.value = t_last_spike
     return spike
 
 
@@ -2500,6 +3280,7 @@ class QuaIFRef(QuaIFRefLTC):
     %s
     %s
     %s
+    %s
   """
 
   def derivative(self, V, t, I):
@@ -2513,8 +3294,8 @@ class QuaIFRef(QuaIFRefLTC):
 
 
 QuaIF.__doc__ = QuaIF.__doc__ % (pneu_doc, dpneu_doc)
-QuaIFRefLTC.__doc__ = QuaIFRefLTC.__doc__ % (pneu_doc, dpneu_doc, ref_doc)
-QuaIFRef.__doc__ = QuaIFRef.__doc__ % (pneu_doc, dpneu_doc, ref_doc)
+QuaIFRefLTC.__doc__ = QuaIFRefLTC.__doc__ % (pneu_doc, dpneu_doc, ref_doc, ref_counter_doc)
+QuaIFRef.__doc__ = QuaIFRef.__doc__ % (pneu_doc, dpneu_doc, ref_doc, ref_counter_doc)
 QuaIFLTC.__doc__ = QuaIFLTC.__doc__ % ()
 
 
@@ -2667,6 +3448,9 @@ class AdQuaIFLTC(GradNeuDyn):
       self.integral = sdeint(method=self.method, f=self.derivative, g=self.noise)
     else:
       self.integral = odeint(method=method, f=self.derivative)
+    self._numba_integral = self.noise is None and method in _EXP_EULER_METHODS
+    self._params_key = None
+    self._params = None
 
     # variables
     if init_var:
@@ -2690,11 +3474,34 @@ class AdQuaIFLTC(GradNeuDyn):
     self.w = self.std_scaling(self.init_variable(self._w_initializer, batch_size))
     self.spike = self.init_variable(partial(bm.zeros, dtype=self.spk_dtype), batch_size)
 
+  def _numba_applicable(self, x, t):
+    return (self._numba_integral and
+            _plain_derivative(self, 'dV', AdQuaIFLTC, AdQuaIF) and
+            _plain_derivative(self, 'dw', AdQuaIFLTC, AdQuaIFLTC) and
+            _eager_on_cpu(self, self.V, x, t))
+
+  def _numba_update(self, x, dt):
+    arg = partial(_numba_lif.as_kernel_arg, dtype=self.V.dtype)
+    V = arg(self.V.value).copy()
+    w = arg(self.w.value).copy()
+    spike = np.zeros(V.shape, dtype=bool)
+    threshold = 1e-8 if V.dtype == np.float64 else 1e-5
+    params = _numba_params(self, dt, ('V_rest', 'V_c', 'c', 'tau', 'a', 'b', 'tau_w', 'V_reset', 'V_th'),
+                           decay=False)
+    _numba_lif.adquaif_step(V, w, spike, arg(x), arg(self.sum_delta_inputs()), V.dtype.type(dt), threshold, params)
+    self.V.value = V.reshape(self.V.shape)
+    self.w.value = w.reshape(self.w.shape)
+    self.spike.value = spike.reshape(self.spike.shape).astype(self.spike.dtype)
+    return self.spike.value
+
   def update(self, x=None):
     t = share.load('t')
     dt = share.load('dt')
     x = 0. if x is None else x
 
+    if self._numba_applicable(x, t):
+      return self._numba_update(x, dt)
+
     # integrate membrane potential
     V, w = self.integral(self.V.value, self.w.value, t, x, dt)
     V += self.sum_delta_inputs()
@@ -2712,9 +3519,8 @@ class AdQuaIFLTC(GradNeuDyn):
       w += self.b * spike
 
     else:
-      spike = V >= self.V_th
-      V = bm.where(spike, self.V_reset, V)
-      w = bm.where(spike, w + self.b, w)
+      V, w, spike = _adapt_spike_reset(bm.as_jax(V), bm.as_jax(w), bm.as_jax(self.V_th),
+                                       bm.as_jax(self.V_reset), bm.as_jax(self.b))
 
     self.V.value = V
     self.w.value = w
@@ -2912,6 +3718,7 @@ class AdQuaIFRefLTC(AdQuaIFLTC):
     %s
     %s
     %s
+    %s
   """
 
   def __init__(
@@ -2945,6 +3752,7 @@ class AdQuaIFRefLTC(AdQuaIFLTC):
       # new neuron parameter
       tau_ref: Union[float, ArrayType, Callable] = 0.,
       ref_var: bool = False,
+      ref_counter: bool = False,
 
       # noise
       noise: Union[float, ArrayType, Callable] = None,
@@ -2975,32 +3783,28 @@ class AdQuaIFRefLTC(AdQuaIFLTC):
       tau=tau,
       tau_w=tau_w,
       V_initializer=V_initializer,
-      w_initializer=w_initializer
+      w_initializer=w_initializer,
+      noise=noise,
     )
 
     # parameters
     self.ref_var = ref_var
+    self.ref_counter = ref_counter
     self.tau_ref = self.init_param(tau_ref)
 
-    # initializers
-    self._V_initializer = is_initializer(V_initializer)
-    self._w_initializer = is_initializer(w_initializer)
-
-    # integral
-    self.noise = init_noise(noise, self.varshape, num_vars=2)
-    if self.noise is not None:
-      self.integral = sdeint(method=self.method, f=self.derivative, g=self.noise)
-    else:
-      self.integral = odeint(method=method, f=self.derivative)
-
     # variables
     if init_var:
       self.reset_state(self.mode)
 
   def reset_state(self, batch_size=None, **kwargs):
     super().reset_state(batch_size, **kwargs)
-    self.t_last_spike = self.init_variable(bm.ones, batch_size)
-    self.t_last_spike.fill_(-1e8)
+    if self.ref_counter:
+      self.steps_since_spike = self.init_variable(
+        partial(bm.full, fill_value=_NO_SPIKE_STEPS, dtype=bm.int32), batch_size
+      )
+    else:
+      self.t_last_spike = self.init_variable(bm.ones, batch_size)
+      self.t_last_spike.fill_(-1e8)
     if self.ref_var:
       self.refractory = self.init_variable(partial(bm.zeros, dtype=bool), batch_size)
 
@@ -3014,9 +3818,7 @@ class AdQuaIFRefLTC(AdQuaIFLTC):
     V += self.sum_delta_inputs()
 
     # refractory
-    refractory = (t - self.t_last_spike) <= self.tau_ref
-    if isinstance(self.mode, bm.TrainingMode):
-      refractory = stop_gradient(refractory)
+    refractory, steps_since_spike = _load_refractory(self, t, dt)
     V = bm.where(refractory, self.V.value, V)
 
     # spike, refractory, spiking time, and membrane potential reset
@@ -3031,22 +3833,19 @@ class AdQuaIFRefLTC(AdQuaIFLTC):
         raise ValueError
       w += self.b * spike_no_grad
       spike_ = spike_no_grad > 0.
-      # will be used in other place, like Delta Synapse, so stop its gradient
       if self.ref_var:
-        self.refractory.value = stop_gradient(bm.logical_or(refractory, spike_).value)
-      t_last_spike = stop_gradient(bm.where(spike_, t, self.t_last_spike.value))
+        self.refractory.value = bm.logical_or(refractory, spike_)
+      _store_spike_timing(self, spike_, t, steps_since_spike)
 
     else:
-      spike = V >= self.V_th
-      V = bm.where(spike, self.V_reset, V)
-      w = bm.where(spike, w + self.b, w)
+      V, w, spike = _adapt_spike_reset(bm.as_jax(V), bm.as_jax(w), bm.as_jax(self.V_th),
+                                       bm.as_jax(self.V_reset), bm.as_jax(self.b))
       if self.ref_var:
         self.refractory.value = bm.logical_or(refractory, spike)
-      t_last_spike = bm.where(spike, t, self.t_last_spike.value)
+      _store_spike_timing(self, spike, t, steps_since_spike)
     self.V.value = V
     self.w.value = w
     self.spike.value = spike
-    self.t_last_spike.value = t_last_spike
     return spike
 
 
@@ -3137,6 +3936,7 @@ class AdQuaIFRef(AdQuaIFRefLTC):
     %s
     %s
     %s
+    %s
   """
 
   def dV(self, V, t, w, I):
@@ -3150,8 +3950,8 @@ class AdQuaIFRef(AdQuaIFRefLTC):
 
 
 AdQuaIF.__doc__ = AdQuaIF.__doc__ % (pneu_doc, dpneu_doc)
-AdQuaIFRefLTC.__doc__ = AdQuaIFRefLTC.__doc__ % (pneu_doc, dpneu_doc, ref_doc)
-AdQuaIFRef.__doc__ = AdQuaIFRef.__doc__ % (pneu_doc, dpneu_doc, ref_doc)
+AdQuaIFRefLTC.__doc__ = AdQuaIFRefLTC.__doc__ % (pneu_doc, dpneu_doc, ref_doc, ref_counter_doc)
+AdQuaIFRef.__doc__ = AdQuaIFRef.__doc__ % (pneu_doc, dpneu_doc, ref_doc, ref_counter_doc)
 AdQuaIFLTC.__doc__ = AdQuaIFLTC.__doc__ % ()
 
 
@@ -3264,6 +4064,11 @@ class GifLTC(GradNeuDyn):
   ================== ================= =========================================================
 
 
+  Args:
+    %s
+    %s
+    %s
+    %s
 """
 
   def __init__(
@@ -3303,6 +4108,9 @@ class GifLTC(GradNeuDyn):
 
       # noise
       noise: Union[float, ArrayType, Callable] = None,
+
+      spk_packed: bool = False,
+      V_dtype: Any = None,
   ):
     # initialization
     super().__init__(size=size,
@@ -3337,6 +4145,8 @@ class GifLTC(GradNeuDyn):
     self._I1_initializer = is_initializer(I1_initializer)
     self._I2_initializer = is_initializer(I2_initializer)
     self._Vth_initializer = is_initializer(Vth_initializer)
+    self.spk_packed = spk_packed
+    self.V_dtype = None if isinstance(self.mode, bm.TrainingMode) else V_dtype
 
     # integral
     self.noise = init_noise(noise, self.varshape, num_vars=4)
@@ -3344,6 +4154,22 @@ class GifLTC(GradNeuDyn):
       self.integral = sdeint(method=self.method, f=self.derivative, g=self.noise)
     else:
       self.integral = odeint(method=method, f=self.derivative)
+    # The currents "I1" and "I2" decay linearly and independently of the
+    # other variables, so that their exponential Euler step is the exact
+    # solution, which is a multiplication by a constant decay factor.
+    # The same holds for "V_th" and "V" when "dV" is declared as linear.
+    self._exact_currents = (self.noise is None and method in _EXP_EULER_METHODS and
+                            type(self).dI1 is GifLTC.dI1 and type(self).dI2 is GifLTC.dI2)
+    self._exact_integral = (self._exact_currents and _is_linear_derivative(self, 'dV') and
+                            type(self).dVth is GifLTC.dVth)
+    if self._exact_currents:
+      self._integral_V = odeint(method=method, f=JointEq(self.dVth, self.dV))
+    self._gif_key = None
+    self._gif_factors = None
+    self._decay_key = None
+    self._decay = None
+    self._params_key = None
+    self._params = None
 
     # variables
     if init_var:
@@ -3367,19 +4193,80 @@ class GifLTC(GradNeuDyn):
     return JointEq(self.dI1, self.dI2, self.dVth, self.dV)
 
   def reset_state(self, batch_size=None, **kwargs):
-    self.V = self.offset_scaling(self.init_variable(self._V_initializer, batch_size))
-    self.V_th = self.offset_scaling(self.init_variable(self._Vth_initializer, batch_size))
-    self.I1 = self.std_scaling(self.init_variable(self._I1_initializer, batch_size))
-    self.I2 = self.std_scaling(self.init_variable(self._I2_initializer, batch_size))
+    V = self.offset_scaling(self.init_variable(self._V_initializer, batch_size))
+    V_th = self.offset_scaling(self.init_variable(self._Vth_initializer, batch_size))
+    I1 = self.std_scaling(self.init_variable(self._I1_initializer, batch_size))
+    I2 = self.std_scaling(self.init_variable(self._I2_initializer, batch_size))
+    if self.V_dtype is not None:
+      V, V_th, I1, I2 = [bm.Variable(v, dtype=self.V_dtype, axis_names=v.axis_names) for v in (V, V_th, I1, I2)]
+    self.V = V
+    self.V_th = V_th
+    self.I1 = I1
+    self.I2 = I2
     self.spike = self.init_variable(partial(bm.zeros, dtype=self.spk_dtype), batch_size)
+    if self.spk_packed:
+      self.spike_bits = self.init_variable(lambda s: pack_spikes(bm.zeros(s, dtype=bool)), batch_size)
+
+  def _load_state(self, var):
+    # the state in the computing precision
+    return var.value if self.V_dtype is None else var.value.astype(bm.float_)
+
+  def _store_state(self, var, value):
+    var.value = value if self.V_dtype is None else value.astype(self.V_dtype)
+
+  def _integrate(self, t, x, dt):
+    """Integrate all variables by one step, using the closed form solution of the
+    decaying currents when possible."""
+    I1, I2 = self._load_state(self.I1), self._load_state(self.I2)
+    V_th, V = self._load_state(self.V_th), self._load_state(self.V)
+    if self._exact_integral:
+      decay1, decay2, th_factor = _gif_factors(self, dt)
+      V_th = V_th + th_factor * self.dVth(V_th, t, V)
+      V = _exp_euler_linear(V, self.V_rest, self.R, x + I1 + I2, _membrane_decay(self, dt))
+      return I1 * decay1, I2 * decay2, V_th, V
+    if self._exact_currents:
+      V_th, V = self._integral_V(V_th, V, t, I1, I2, x, dt)
+      decay1, decay2, _ = _gif_factors(self, dt)
+      return I1 * decay1, I2 * decay2, V_th, V
+    return self.integral(I1, I2, V_th, V, t, x, dt)
+
+  _numba_columns = ('V_rest', 'R', 'a', 'b', 'V_th_inf', 'V_reset', 'V_th_reset', 'R1', 'A1', 'R2', 'A2')
+
+  def _numba_applicable(self, x, t):
+    return (self._exact_currents and
+            self.V_dtype is None and
+            not self.spk_packed and
+            type(self).dVth is GifLTC.dVth and
+            _plain_derivative(self, 'dV', GifLTC, Gif) and
+            _eager_on_cpu(self, self.V, x, t))
+
+  def _numba_update(self, x, dt):
+    arg = partial(_numba_lif.as_kernel_arg, dtype=self.V.dtype)
+    V = arg(self.V.value).copy()
+    V_th = arg(self.V_th.value).copy()
+    I1 = arg(self.I1.value).copy()
+    I2 = arg(self.I2.value).copy()
+    spike = np.zeros(V.shape, dtype=bool)
+    factors = _numba_lif.pack_params(_gif_factors(self, dt), V.dtype)
+    params = _numba_params(self, dt, self._numba_columns)
+    _numba_lif.gif_step(V, V_th, I1, I2, spike, arg(x), arg(self.sum_delta_inputs()), factors, params)
+    self.V.value = V.reshape(self.V.shape)
+    self.V_th.value = V_th.reshape(self.V_th.shape)
+    self.I1.value = I1.reshape(self.I1.shape)
+    self.I2.value = I2.reshape(self.I2.shape)
+    self.spike.value = spike.reshape(self.spike.shape).astype(self.spike.dtype)
+    return self.spike.value
 
   def update(self, x=None):
     t = share.load('t')
     dt = share.load('dt')
     x = 0. if x is None else x
 
+    if self._numba_applicable(x, t):
+      return self._numba_update(x, dt)
+
     # integrate membrane potential
-    I1, I2, V_th, V = self.integral(self.I1.value, self.I2.value, self.V_th.value, self.V.value, t, x, dt)
+    I1, I2, V_th, V = self._integrate(t, x, dt)
     V += self.sum_delta_inputs()
 
     # spike, spiking time, and membrane potential reset
@@ -3397,21 +4284,42 @@ class GifLTC(GradNeuDyn):
       V_th += (bm.maximum(self.V_th_reset, V_th) - V_th) * spike
 
     else:
-      spike = self.V_th <= V
-      V = bm.where(spike, self.V_reset, V)
-      I1 = bm.where(spike, self.R1 * I1 + self.A1, I1)
-      I2 = bm.where(spike, self.R2 * I2 + self.A2, I2)
-      V_th = bm.where(spike, bm.maximum(self.V_th_reset, V_th), V_th)
+      V, I1, I2, V_th, spike = _gif_spike_reset(bm.as_jax(V), bm.as_jax(I1), bm.as_jax(I2), bm.as_jax(V_th),
+                                                self._load_state(self.V_th), bm.as_jax(self.V_reset),
+                                                bm.as_jax(self.V_th_reset), bm.as_jax(self.R1),
+                                                bm.as_jax(self.A1), bm.as_jax(self.R2), bm.as_jax(self.A2))
     self.spike.value = spike
-    self.I1.value = I1
-    self.I2.value = I2
-    self.V_th.value = V_th
-    self.V.value = V
+    self._store_state(self.I1, I1)
+    self._store_state(self.I2, I2)
+    self._store_state(self.V_th, V_th)
+    self._store_state(self.V, V)
+    if self.spk_packed:
+      self.spike_bits.value = pack_spikes(spike)
     return spike
 
   def return_info(self):
     return self.spike
 
+  _fused_params = ('V_rest', 'V_reset', 'V_th_inf', 'V_th_reset', 'R', 'tau', 'a', 'b',
+                   'k1', 'k2', 'R1', 'R2', 'A1', 'A2')
+  _fused_states = ('V', 'V_th', 'I1', 'I2', 'spike')
+
+  def _fused_kwargs(self):
+    return dict(mode=self.mode, method=self.method, scaling=self.scaling, spk_fun=self.spk_fun,
+                spk_dtype=self._spk_dtype, spk_reset=self.spk_reset, detach_spk=self.detach_spk,
+                spk_packed=self.spk_packed, V_dtype=self.V_dtype)
+
+  @classmethod
+  def fuse(cls, groups: Sequence['GifLTC']):
+    """Fuse several groups of the same neuron type into one group.
+
+    See :py:meth:`AdExIFLTC.fuse` for the requirements on the groups.
+
+    Returns:
+      The fused group, and the views of the fused group corresponding to each given group.
+    """
+    return _fuse_groups(cls, groups)
+
 
 class Gif(GifLTC):
   r"""Generalized Integrate-and-Fire model.
@@ -3526,14 +4434,18 @@ class Gif(GifLTC):
   Args:
     %s
     %s
+    %s
+    %s
   """
 
+  _is_linear = True
+
   def dV(self, V, t, I1, I2, I):
     return (- (V - self.V_rest) + self.R * (I + I1 + I2)) / self.tau
 
   def update(self, x=None):
     x = 0. if x is None else x
-    x = self.sum_current_inputs(self.V.value, init=x)
+    x = self.sum_current_inputs(self._load_state(self.V), init=x)
     return super().update(x)
 
 
@@ -3652,6 +4564,8 @@ class GifRefLTC(GifLTC):
     %s
     %s
     %s
+    %s
+    %s
 """
 
   def __init__(
@@ -3695,6 +4609,9 @@ class GifRefLTC(GifLTC):
 
       # noise
       noise: Union[float, ArrayType, Callable] = None,
+
+      spk_packed: bool = False,
+      V_dtype: Any = None,
   ):
     # initialization
     super().__init__(
@@ -3730,25 +4647,15 @@ class GifRefLTC(GifLTC):
       I1_initializer=I1_initializer,
       I2_initializer=I2_initializer,
       Vth_initializer=Vth_initializer,
+      noise=noise,
+      spk_packed=spk_packed,
+      V_dtype=V_dtype,
     )
 
     # parameters
     self.ref_var = ref_var
     self.tau_ref = self.init_param(tau_ref)
 
-    # initializers
-    self._V_initializer = is_initializer(V_initializer)
-    self._I1_initializer = is_initializer(I1_initializer)
-    self._I2_initializer = is_initializer(I2_initializer)
-    self._Vth_initializer = is_initializer(Vth_initializer)
-
-    # integral
-    self.noise = init_noise(noise, self.varshape, num_vars=4)
-    if self.noise is not None:
-      self.integral = sdeint(method=self.method, f=self.derivative, g=self.noise)
-    else:
-      self.integral = odeint(method=method, f=self.derivative)
-
     # variables
     if init_var:
       self.reset_state(self.mode)
@@ -3766,17 +4673,13 @@ class GifRefLTC(GifLTC):
     x = 0. if x is None else x
 
     # integrate membrane potential
-    I1, I2, V_th, V = self.integral(self.I1.value, self.I2.value, self.V_th.value, self.V.value, t, x, dt)
+    I1, I2, V_th, V = self._integrate(t, x, dt)
     V += self.sum_delta_inputs()
 
-    # refractory
-    refractory = (t - self.t_last_spike) <= self.tau_ref
-    if isinstance(self.mode, bm.TrainingMode):
-      refractory = stop_gradient(refractory)
-    V = bm.where(refractory, self.V.value, V)
-
-    # spike, refractory, spiking time, and membrane potential reset
+    # refractory, spike, spiking time, and membrane potential reset
     if isinstance(self.mode, bm.TrainingMode):
+      refractory = (t - self.t_last_spike) <= self.tau_ref
+      V = bm.where(refractory, self.V.value, V)
       spike = self.spk_fun(V - self.V_th)
       spike_no_grad = stop_gradient(spike) if self.detach_spk else spike
       if self.spk_reset == 'soft':
@@ -3789,28 +4692,35 @@ class GifRefLTC(GifLTC):
       I2 += spike * (self.R2 * I2 + self.A2 - I2)
       V_th += (bm.maximum(self.V_th_reset, V_th) - V_th) * spike_no_grad
       spike_ = spike_no_grad > 0.
-      # will be used in other place, like Delta Synapse, so stop its gradient
       if self.ref_var:
-        self.refractory.value = stop_gradient(bm.logical_or(refractory, spike_).value)
-      t_last_spike = stop_gradient(bm.where(spike_, t, self.t_last_spike.value))
+        self.refractory.value = bm.logical_or(refractory, spike_)
+      t_last_spike = bm.where(spike_, t, self.t_last_spike.value)
 
     else:
-      spike = V >= self.V_th
-      V = bm.where(spike, self.V_reset, V)
-      I1 = bm.where(spike, self.R1 * I1 + self.A1, I1)
-      I2 = bm.where(spike, self.R2 * I2 + self.A2, I2)
-      V_th = bm.where(spike, bm.maximum(self.V_th_reset, V_th), V_th)
+      V, I1, I2, V_th, spike, refractory, t_last_spike = _gif_ref_spike_reset(
+        bm.as_jax(V), bm.as_jax(I1), bm.as_jax(I2), bm.as_jax(V_th), self._load_state(self.V),
+        self._load_state(self.V_th), self.t_last_spike.value, t, bm.as_jax(self.tau_ref),
+        bm.as_jax(self.V_reset), bm.as_jax(self.V_th_reset), bm.as_jax(self.R1), bm.as_jax(self.A1),
+        bm.as_jax(self.R2), bm.as_jax(self.A2)
+      )
       if self.ref_var:
-        self.refractory.value = bm.logical_or(refractory, spike)
-      t_last_spike = bm.where(spike, t, self.t_last_spike.value)
-    self.V.value = V
-    self.I1.value = I1
-    self.I2.value = I2
-    self.V_th.value = V_th
+        self.refractory.value = refractory
+    self._store_state(self.V, V)
+    self._store_state(self.I1, I1)
+    self._store_state(self.I2, I2)
+    self._store_state(self.V_th, V_th)
     self.spike.value = spike
     self.t_last_spike.value = t_last_spike
+    if self.spk_packed:
+      self.spike_bits.value = pack_spikes(spike)
     return spike
 
+  _fused_params = GifLTC._fused_params + ('tau_ref',)
+  _fused_states = GifLTC._fused_states + ('t_last_spike', 'refractory')
+
+  def _fused_kwargs(self):
+    return dict(super()._fused_kwargs(), ref_var=self.ref_var)
+
 
 class GifRef(GifRefLTC):
   r"""Generalized Integrate-and-Fire model.
@@ -3926,110 +4836,119 @@ class GifRef(GifRefLTC):
     %s
     %s
     %s
+    %s
+    %s
 """
 
+  _is_linear = True
+
   def dV(self, V, t, I1, I2, I):
     return (- (V - self.V_rest) + self.R * (I + I1 + I2)) / self.tau
 
   def update(self, x=None):
     x = 0. if x is None else x
-    x = self.sum_current_inputs(self.V.value, init=x)
+    x = self.sum_current_inputs(self._load_state(self.V), init=x)
     return super().update(x)
 
 
-Gif.__doc__ = Gif.__doc__ % (pneu_doc, dpneu_doc)
-GifRefLTC.__doc__ = GifRefLTC.__doc__ % (pneu_doc, dpneu_doc, ref_doc)
-GifRef.__doc__ = GifRef.__doc__ % (pneu_doc, dpneu_doc, ref_doc)
-GifLTC.__doc__ = GifLTC.__doc__ % ()
+Gif.__doc__ = Gif.__doc__ % (pneu_doc, dpneu_doc, spk_packed_doc, gif_V_dtype_doc)
+GifRefLTC.__doc__ = GifRefLTC.__doc__ % (pneu_doc, dpneu_doc, ref_doc, spk_packed_doc, gif_V_dtype_doc)
+GifRef.__doc__ = GifRef.__doc__ % (pneu_doc, dpneu_doc, ref_doc, spk_packed_doc, gif_V_dtype_doc)
+GifLTC.__doc__ = GifLTC.__doc__ % (pneu_doc, dpneu_doc, spk_packed_doc, gif_V_dtype_doc)
 
 
 class IzhikevichLTC(GradNeuDyn):
   r"""The Izhikevich neuron model with liquid time-constant.
 
-    **Model Descriptions**
+  **Model Descriptions**
 
-    The dynamics of the Izhikevich neuron model [1]_ [2]_ is given by:
+  The dynamics of the Izhikevich neuron model [1]_ [2]_ is given by:
 
-    .. math ::
+  .. math ::
 
-        \frac{d V}{d t} &= 0.04 V^{2}+5 V+140-u+I
+      \frac{d V}{d t} &= 0.04 V^{2}+5 V+140-u+I
 
-        \frac{d u}{d t} &=a(b V-u)
+      \frac{d u}{d t} &=a(b V-u)
 
-    .. math ::
+  .. math ::
 
-        \text{if}  v \geq 30  \text{mV}, \text{then}
-        \begin{cases} v \leftarrow c \\
-        u \leftarrow u+d \end{cases}
+      \text{if}  v \geq 30  \text{mV}, \text{then}
+      \begin{cases} v \leftarrow c \\
+      u \leftarrow u+d \end{cases}
 
 
-    **References**
+  **References**
 
-    .. [1] Izhikevich, Eugene M. "Simple model of spiking neurons." IEEE
-           Transactions on neural networks 14.6 (2003): 1569-1572.
+  .. [1] Izhikevich, Eugene M. "Simple model of spiking neurons." IEEE
+         Transactions on neural networks 14.6 (2003): 1569-1572.
 
-    .. [2] Izhikevich, Eugene M. "Which model to use for cortical spiking neurons?."
-           IEEE transactions on neural networks 15.5 (2004): 1063-1070.
+  .. [2] Izhikevich, Eugene M. "Which model to use for cortical spiking neurons?."
+         IEEE transactions on neural networks 15.5 (2004): 1063-1070.
 
-    **Examples**
+  **Examples**
 
-    There is a simple usage example::
+  There is a simple usage example::
 
-      import brainpy as bp
+    import brainpy as bp
 
-      neu = bp.dyn.IzhikevichLTC(2)
+    neu = bp.dyn.IzhikevichLTC(2)
 
-      # section input with wiener process
-      inp1 = bp.inputs.wiener_process(500., n=1, t_start=100., t_end=400.).flatten()
-      inputs = bp.inputs.section_input([0., 22., 0.], [100., 300., 100.]) + inp1
+    # section input with wiener process
+    inp1 = bp.inputs.wiener_process(500., n=1, t_start=100., t_end=400.).flatten()
+    inputs = bp.inputs.section_input([0., 22., 0.], [100., 300., 100.]) + inp1
 
-      runner = bp.DSRunner(neu, monitors=['V'])
-      runner.run(inputs=inputs)
+    runner = bp.DSRunner(neu, monitors=['V'])
+    runner.run(inputs=inputs)
 
-      bp.visualize.line_plot(runner.mon['ts'], runner.mon['V'], plot_ids=(0, 1), show=True)
+    bp.visualize.line_plot(runner.mon['ts'], runner.mon['V'], plot_ids=(0, 1), show=True)
 
 
 
-    **Model Examples**
+  **Model Examples**
 
-    - `Detailed examples to reproduce different firing patterns <https://brainpy-examples.readthedocs.io/en/latest/neurons/Izhikevich_2003_Izhikevich_model.html>`_
+  - `Detailed examples to reproduce different firing patterns <https://brainpy-examples.readthedocs.io/en/latest/neurons/Izhikevich_2003_Izhikevich_model.html>`_
 
-    **Model Parameters**
+  **Model Parameters**
 
-    ============= ============== ======== ================================================================================
-    **Parameter** **Init Value** **Unit** **Explanation**
-    ------------- -------------- -------- --------------------------------------------------------------------------------
-    a             0.02           \        It determines the time scaling of
-                                          the recovery variable :math:`u`.
-    b             0.2            \        It describes the sensitivity of the
-                                          recovery variable :math:`u` to
-                                          the sub-threshold fluctuations of the
-                                          membrane potential :math:`v`.
-    c             -65            \        It describes the after-spike reset value
-                                          of the membrane potential :math:`v` caused by
-                                          the fast high-threshold :math:`K^{+}`
-                                          conductance.
-    d             8              \        It describes after-spike reset of the
-                                          recovery variable :math:`u`
-                                          caused by slow high-threshold
-                                          :math:`Na^{+}` and :math:`K^{+}` conductance.
-    tau_ref       0              ms       Refractory period length. [ms]
-    V_th          30             mV       The membrane potential threshold.
-    ============= ============== ======== ================================================================================
+  ============= ============== ======== ================================================================================
+  **Parameter** **Init Value** **Unit** **Explanation**
+  ------------- -------------- -------- --------------------------------------------------------------------------------
+  a             0.02           \        It determines the time scaling of
+                                        the recovery variable :math:`u`.
+  b             0.2            \        It describes the sensitivity of the
+                                        recovery variable :math:`u` to
+                                        the sub-threshold fluctuations of the
+                                        membrane potential :math:`v`.
+  c             -65            \        It describes the after-spike reset value
+                                        of the membrane potential :math:`v` caused by
+                                        the fast high-threshold :math:`K^{+}`
+                                        conductance.
+  d             8              \        It describes after-spike reset of the
+                                        recovery variable :math:`u`
+                                        caused by slow high-threshold
+                                        :math:`Na^{+}` and :math:`K^{+}` conductance.
+  tau_ref       0              ms       Refractory period length. [ms]
+  V_th          30             mV       The membrane potential threshold.
+  ============= ============== ======== ================================================================================
 
-    **Model Variables**
+  **Model Variables**
 
-    ================== ================= =========================================================
-    **Variables name** **Initial Value** **Explanation**
-    ------------------ ----------------- ---------------------------------------------------------
-    V                          -65        Membrane potential.
-    u                          1          Recovery variable.
-    input                      0          External and synaptic input current.
-    spike                      False      Flag to mark whether the neuron is spiking.
-    refractory                False       Flag to mark whether the neuron is in refractory period.
-    t_last_spike               -1e7       Last spike time stamp.
-    ================== ================= =========================================================
-    """
+  ================== ================= =========================================================
+  **Variables name** **Initial Value** **Explanation**
+  ------------------ ----------------- ---------------------------------------------------------
+  V                          -65        Membrane potential.
+  u                          1          Recovery variable.
+  input                      0          External and synaptic input current.
+  spike                      False      Flag to mark whether the neuron is spiking.
+  refractory                False       Flag to mark whether the neuron is in refractory period.
+  t_last_spike               -1e7       Last spike time stamp.
+  ================== ================= =========================================================
+
+  Args:
+    %s
+    %s
+    %s
+  """
 
   def __init__(
       self,
@@ -4062,6 +4981,8 @@ class IzhikevichLTC(GradNeuDyn):
 
       # noise
       noise: Union[float, ArrayType, Callable] = None,
+
+      spk_packed: bool = False,
   ):
     # initialization
     super().__init__(size=size,
@@ -4093,6 +5014,7 @@ class IzhikevichLTC(GradNeuDyn):
     # initializers
     self._V_initializer = is_initializer(V_initializer)
     self._u_initializer = is_initializer(u_initializer, allow_none=True)
+    self.spk_packed = spk_packed
 
     # integral
     self.noise = init_noise(noise, self.varshape, num_vars=2)
@@ -4126,6 +5048,8 @@ class IzhikevichLTC(GradNeuDyn):
     self.u = self.offset_scaling(self.init_variable(self._u_initializer, batch_size), bias=self.b * self.scaling.bias,
                                  scale=self.scaling.scale)
     self.spike = self.init_variable(partial(bm.zeros, dtype=self.spk_dtype), batch_size)
+    if self.spk_packed:
+      self.spike_bits = self.init_variable(lambda s: pack_spikes(bm.zeros(s, dtype=bool)), batch_size)
 
   def update(self, x=None):
     t = share.load('t')
@@ -4144,18 +5068,38 @@ class IzhikevichLTC(GradNeuDyn):
       u += spike * self.d
 
     else:
-      spike = V >= self.V_th
-      V = bm.where(spike, self.c, V)
-      u = bm.where(spike, u + self.d, u)
+      V, u, spike = _adapt_spike_reset(bm.as_jax(V), bm.as_jax(u), bm.as_jax(self.V_th),
+                                       bm.as_jax(self.c), bm.as_jax(self.d))
 
     self.V.value = V
     self.u.value = u
     self.spike.value = spike
+    if self.spk_packed:
+      self.spike_bits.value = pack_spikes(spike)
     return spike
 
   def return_info(self):
     return self.spike
 
+  _fused_params = ('V_th', 'p1', 'p2', 'p3', 'a', 'b', 'c', 'd', 'R', 'tau')
+  _fused_states = ('V', 'u', 'spike')
+
+  def _fused_kwargs(self):
+    return dict(mode=self.mode, method=self.method, scaling=self.scaling, spk_fun=self.spk_fun,
+                spk_dtype=self._spk_dtype, spk_reset=self.spk_reset, detach_spk=self.detach_spk,
+                spk_packed=self.spk_packed)
+
+  @classmethod
+  def fuse(cls, groups: Sequence['IzhikevichLTC']):
+    """Fuse several groups of the same neuron type into one group.
+
+    See :py:meth:`AdExIFLTC.fuse` for the requirements on the groups.
+
+    Returns:
+      The fused group, and the views of the fused group corresponding to each given group.
+    """
+    return _fuse_groups(cls, groups)
+
 
 class Izhikevich(IzhikevichLTC):
   r"""The Izhikevich neuron model.
@@ -4247,6 +5191,7 @@ class Izhikevich(IzhikevichLTC):
   Args:
     %s
     %s
+    %s
 
   """
 
@@ -4351,6 +5296,7 @@ class IzhikevichRefLTC(IzhikevichLTC):
     %s
     %s
     %s
+    %s
 
   """
 
@@ -4389,6 +5335,8 @@ class IzhikevichRefLTC(IzhikevichLTC):
 
       # noise
       noise: Union[float, ArrayType, Callable] = None,
+
+      spk_packed: bool = False,
   ):
     # initialization
     super().__init__(
@@ -4417,24 +5365,15 @@ class IzhikevichRefLTC(IzhikevichLTC):
       R=R,
       tau=tau,
       V_initializer=V_initializer,
-      u_initializer=u_initializer
+      u_initializer=u_initializer,
+      noise=noise,
+      spk_packed=spk_packed,
     )
 
     # parameters
     self.ref_var = ref_var
     self.tau_ref = self.init_param(tau_ref)
 
-    # initializers
-    self._V_initializer = is_initializer(V_initializer)
-    self._u_initializer = is_initializer(u_initializer, allow_none=True)
-
-    # integral
-    self.noise = init_noise(noise, self.varshape, num_vars=2)
-    if self.noise is not None:
-      self.integral = sdeint(method=self.method, f=self.derivative, g=self.noise)
-    else:
-      self.integral = odeint(method=method, f=self.derivative)
-
     # variables
     if init_var:
       self.reset_state(self.mode)
@@ -4455,37 +5394,40 @@ class IzhikevichRefLTC(IzhikevichLTC):
     V, u = self.integral(self.V.value, self.u.value, t, x, dt)
     V += self.sum_delta_inputs()
 
-    # refractory
-    refractory = (t - self.t_last_spike) <= self.tau_ref
-    if isinstance(self.mode, bm.TrainingMode):
-      refractory = stop_gradient(refractory)
-    V = bm.where(refractory, self.V.value, V)
-
-    # spike, refractory, spiking time, and membrane potential reset
+    # refractory, spike, spiking time, and membrane potential reset
     if isinstance(self.mode, bm.TrainingMode):
+      refractory = (t - self.t_last_spike) <= self.tau_ref
+      V = bm.where(refractory, self.V.value, V)
       spike = self.spk_fun(V - self.V_th)
       spike_no_grad = stop_gradient(spike) if self.detach_spk else spike
       V += spike * (self.c - V)
       u += spike * self.d
       spike_ = spike_no_grad > 0.
-      # will be used in other place, like Delta Synapse, so stop its gradient
       if self.ref_var:
-        self.refractory.value = stop_gradient(bm.logical_or(refractory, spike_).value)
-      t_last_spike = stop_gradient(bm.where(spike_, t, self.t_last_spike.value))
+        self.refractory.value = bm.logical_or(refractory, spike_)
+      t_last_spike = bm.where(spike_, t, self.t_last_spike.value)
 
     else:
-      spike = V >= self.V_th
-      V = bm.where(spike, self.c, V)
-      u = bm.where(spike, u + self.d, u)
+      V, u, spike, refractory, t_last_spike = _adapt_ref_spike_reset(
+        bm.as_jax(V), bm.as_jax(u), self.V.value, self.t_last_spike.value, t, bm.as_jax(self.V_th),
+        bm.as_jax(self.c), bm.as_jax(self.d), bm.as_jax(self.tau_ref)
+      )
       if self.ref_var:
-        self.refractory.value = bm.logical_or(refractory, spike)
-      t_last_spike = bm.where(spike, t, self.t_last_spike.value)
+        self.refractory.value = refractory
     self.V.value = V
     self.u.value = u
     self.spike.value = spike
     self.t_last_spike.value = t_last_spike
+    if self.spk_packed:
+      self.spike_bits.value = pack_spikes(spike)
     return spike
 
+  _fused_params = IzhikevichLTC._fused_params + ('tau_ref',)
+  _fused_states = IzhikevichLTC._fused_states + ('t_last_spike', 'refractory')
+
+  def _fused_kwargs(self):
+    return dict(super()._fused_kwargs(), ref_var=self.ref_var)
+
 
 class IzhikevichRef(IzhikevichRefLTC):
   r"""The Izhikevich neuron model.
@@ -4580,6 +5522,7 @@ class IzhikevichRef(IzhikevichRefLTC):
     %s
     %s
     %s
+    %s
  """
 
   def dV(self, V, t, u, I):
@@ -4592,7 +5535,7 @@ class IzhikevichRef(IzhikevichRefLTC):
     return super().update(x)
 
 
-Izhikevich.__doc__ = Izhikevich.__doc__ % (pneu_doc, dpneu_doc)
-IzhikevichRefLTC.__doc__ = IzhikevichRefLTC.__doc__ % (pneu_doc, dpneu_doc, ref_doc)
-IzhikevichRef.__doc__ = IzhikevichRef.__doc__ % (pneu_doc, dpneu_doc, ref_doc)
-IzhikevichLTC.__doc__ = IzhikevichLTC.__doc__ % ()
+Izhikevich.__doc__ = Izhikevich.__doc__ % (pneu_doc, dpneu_doc, spk_packed_doc)
+IzhikevichRefLTC.__doc__ = IzhikevichRefLTC.__doc__ % (pneu_doc, dpneu_doc, ref_doc, spk_packed_doc)
+IzhikevichRef.__doc__ = IzhikevichRef.__doc__ % (pneu_doc, dpneu_doc, ref_doc, spk_packed_doc)
+IzhikevichLTC.__doc__ = IzhikevichLTC.__doc__ % (pneu_doc, dpneu_doc, spk_packed_doc)
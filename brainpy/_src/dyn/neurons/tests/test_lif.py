@@ -1,10 +1,17 @@
 # -*- coding: utf-8 -*-
+import unittest
+from unittest import mock
+
+import jax
+import jax.numpy as jnp
 import numpy as np
 
 import brainpy as bp
 import brainpy.math as bm
 from absl.testing import parameterized
-from brainpy._src.dyn.neurons import lif
+from brainpy._src.dyn.neurons import lif, _numba_lif
+
+skip_without_numba = unittest.skipUnless(_numba_lif.numba is not None, 'Numba is not installed.')
 
 
 class Test_lif(parameterized.TestCase):
@@ -59,4 +66,375 @@ class Test_lif(parameterized.TestCase):
       indices = bm.arange(5000)
       spks1 = bm.for_loop(lambda i: model1.step_run(i, 10./model1.scaling.scale), indices, jit=True)
       spks2 = bm.for_loop(lambda i: model2.step_run(i, 10./model2.scaling.scale), indices, jit=True)
-      self.assertTrue(np.allclose(spks1, spks2))
\ No newline at end of file
+      self.assertTrue(np.allclose(spks1, spks2))
+
+  @parameterized.named_parameters(
+    {'testcase_name': f'{name}', 'neuron': name}
+    for name in ['IF', 'Lif', 'LifRef']
+  )
+  def test_exact_linear_integral(self, neuron):
+    model1 = getattr(lif, neuron)(size=1)
+    model2 = getattr(lif, neuron + 'LTC')(size=1)
+    self.assertTrue(model1._exact_integral)
+    self.assertFalse(model2._exact_integral)
+    runner1 = bp.DSRunner(model1, monitors=['V'], progress_bar=False)
+    runner2 = bp.DSRunner(model2, monitors=['V'], progress_bar=False)
+    runner1.run(inputs=bp.inputs.section_input([0., 21., 0.], [10., 30., 10.]))
+    runner2.run(inputs=bp.inputs.section_input([0., 21., 0.], [10., 30., 10.]))
+    self.assertTrue(np.allclose(runner1.mon['V'], runner2.mon['V'], atol=1e-4))
+
+  @parameterized.named_parameters(
+    {'testcase_name': f'{name}', 'neuron': name}
+    for name in ['Gif', 'GifLTC', 'GifRef', 'GifRefLTC']
+  )
+  def test_exact_gif_integral(self, neuron):
+    kwargs = dict(A1=5., A2=-1., R1=0.5, a=0.005)
+    model1 = getattr(lif, neuron)(size=1, **kwargs)
+    model2 = getattr(lif, neuron)(size=1, **kwargs)
+    model2._exact_currents = model2._exact_integral = False
+    self.assertTrue(model1._exact_currents)
+    self.assertEqual(model1._exact_integral, not neuron.endswith('LTC'))
+    self.assertFalse(getattr(lif, neuron)(size=1, method='rk4')._exact_currents)
+    runner1 = bp.DSRunner(model1, monitors=['V', 'I1', 'I2'], progress_bar=False)
+    runner2 = bp.DSRunner(model2, monitors=['V', 'I1', 'I2'], progress_bar=False)
+    runner1.run(inputs=bp.inputs.section_input([0., 1.5, 0.], [10., 30., 10.]))
+    runner2.run(inputs=bp.inputs.section_input([0., 1.5, 0.], [10., 30., 10.]))
+    self.assertTrue(runner1.mon['I1'].any())
+    for key in ['V', 'I1', 'I2']:
+      self.assertTrue(np.allclose(runner1.mon[key], runner2.mon[key], atol=1e-4))
+
+  @parameterized.named_parameters(
+    {'testcase_name': f'{name}', 'neuron': name}
+    for name in ['Lif', 'LifLTC', 'LifRef', 'LifRefLTC', 'Gif', 'GifRef', 'Izhikevich', 'IzhikevichRef']
+  )
+  def test_run_steps(self, neuron):
+    kwargs = dict() if neuron.startswith('Lif') else dict(V_initializer=bp.init.Constant(-65.))
+    model1 = getattr(lif, neuron)(size=10, **kwargs)
+    model2 = getattr(lif, neuron)(size=10, **kwargs)
+    inputs = bm.ones((100, 10)) * 25.
+    spks1 = model1.run_steps(inputs)
+    spks2 = bm.for_loop(lambda i, x: model2.step_run(i, x), (bm.arange(100), inputs))
+    self.assertTupleEqual(spks1.shape, (100, 10))
+    self.assertTrue(np.allclose(spks1, spks2))
+    self.assertTrue(np.allclose(model1.V, model2.V))
+
+  @parameterized.named_parameters(
+    {'testcase_name': f'{name}', 'neuron': name}
+    for name in ['Lif', 'LifLTC']
+  )
+  def test_run_steps_parallel(self, neuron):
+    model1 = getattr(lif, neuron)(size=20)
+    model2 = getattr(lif, neuron)(size=20)
+    inputs = bm.random.uniform(10., 40., (300, 20))
+    spks1 = model1.run_steps(inputs)
+    spks2 = model2.run_steps_parallel(inputs)
+    self.assertTrue(np.asarray(spks1).any())
+    self.assertTrue(np.array_equal(spks1, spks2))
+    self.assertTrue(np.allclose(model1.V, model2.V, atol=1e-4))
+    with self.assertRaises(ValueError):
+      lif.LifRef(size=20).run_steps_parallel(inputs)
+
+  @parameterized.named_parameters(
+    {'testcase_name': f'{name}', 'neuron': name}
+    for name in ['LifRef', 'LifRefLTC', 'AdExIFRef', 'AdExIFRefLTC', 'QuaIFRef', 'AdQuaIFRef']
+  )
+  def test_ref_counter(self, neuron):
+    kwargs = dict() if neuron.startswith('Lif') else dict(V_initializer=bp.init.Constant(-65.))
+    model1 = getattr(lif, neuron)(size=10, tau_ref=1.55, ref_var=True, **kwargs)
+    model2 = getattr(lif, neuron)(size=10, tau_ref=1.55, ref_var=True, ref_counter=True, **kwargs)
+    self.assertEqual(model2.steps_since_spike.dtype, bm.int32)
+    inputs = bm.ones((1000, 10)) * 30.
+    run = lambda model: bp.DSRunner(model, progress_bar=False).run(inputs=inputs)
+    spks1 = run(model1)
+    spks2 = run(model2)
+    self.assertTrue(spks1.sum() > 0)
+    self.assertTrue(np.allclose(spks1, spks2))
+    self.assertTrue(np.allclose(model1.refractory, model2.refractory))
+
+  @parameterized.named_parameters(
+    {'testcase_name': f'{name}', 'neuron': name}
+    for name in ['Lif', 'LifRef', 'AdExIF', 'AdExIFRef', 'Gif', 'GifRef', 'Izhikevich', 'IzhikevichRef']
+  )
+  def test_spk_packed(self, neuron):
+    from brainpy._src.dyn.utils import unpack_spikes
+    kwargs = dict(ref_var=True, tau_ref=2.) if neuron == 'LifRef' else dict()
+    if not neuron.startswith('Lif'):
+      kwargs['V_initializer'] = bp.init.Constant(-65.)
+    model = getattr(lif, neuron)(size=70, spk_packed=True, **kwargs)
+    self.assertTupleEqual(model.spike_bits.shape, (3,))
+    inputs = bm.random.uniform(10., 40., (100, 70))
+    bm.for_loop(lambda i, x: model.step_run(i, x), (bm.arange(100), inputs))
+    self.assertTrue(np.array_equal(unpack_spikes(model.spike_bits, 70), model.spike))
+    if neuron == 'LifRef':
+      self.assertTrue(np.array_equal(unpack_spikes(model.refractory_bits, 70), model.refractory))
+
+  def test_pack_spikes_uint64(self):
+    from brainpy._src.dyn.utils import pack_spikes, unpack_spikes
+    spike = bm.random.rand(4, 130) < 0.3
+    if jax.config.jax_enable_x64:
+      bits = pack_spikes(spike, dtype=jnp.uint64)
+      self.assertTupleEqual(bits.shape, (4, 3))
+      self.assertTrue(np.array_equal(unpack_spikes(bits, 130), spike))
+    else:
+      with self.assertRaises(ValueError):
+        pack_spikes(spike, dtype=jnp.uint64)
+
+  @parameterized.named_parameters(
+    {'testcase_name': f'{name}', 'neuron': name}
+    for name in ['Lif', 'LifRef', 'ExpIF', 'ExpIFRef', 'AdExIF', 'QuaIF', 'AdQuaIF',
+                 'Gif', 'GifRef', 'Izhikevich', 'IzhikevichRef']
+  )
+  def test_eager_update(self, neuron):
+    kwargs = dict() if neuron.startswith('Lif') else dict(V_initializer=bp.init.Constant(-65.))
+    if neuron.endswith('Ref'):
+      kwargs['tau_ref'] = 1.
+    inputs = bm.asarray(np.random.RandomState(0).uniform(20., 40., (100, 10)))
+    model1 = getattr(lif, neuron)(size=10, method='rk4', **kwargs)
+    model2 = getattr(lif, neuron)(size=10, method='rk4', **kwargs)
+    runner = bp.DSRunner(model1, monitors=['V'], jit=False, progress_bar=False)
+    runner.run(inputs=inputs)
+    bp.DSRunner(model2, progress_bar=False).run(inputs=inputs)
+    self.assertTupleEqual(runner.mon.V.shape, (100, 10))
+    # the quadratic dynamics amplify the rounding differences between eager and jitted ops
+    atol = 1e-3 if neuron.startswith('Izhikevich') else 1e-4
+    self.assertTrue(np.allclose(model1.V, model2.V, atol=atol))
+
+  @parameterized.named_parameters(
+    {'testcase_name': f'{name}', 'neuron': name}
+    for name in ['Lif', 'LifLTC', 'LifRef', 'LifRefLTC']
+  )
+  def test_V_dtype(self, neuron):
+    model1 = getattr(lif, neuron)(size=10)
+    model2 = getattr(lif, neuron)(size=10, V_dtype=bm.bfloat16)
+    self.assertEqual(model2.V.dtype, bm.bfloat16)
+    inputs = bm.ones((100, 10)) * 25.
+    model1.run_steps(inputs)
+    model2.run_steps(inputs)
+    self.assertEqual(model2.V.dtype, bm.bfloat16)
+    self.assertTrue(np.allclose(model1.V, model2.V.astype(bm.float32), atol=0.2))
+
+  @parameterized.named_parameters(
+    {'testcase_name': f'{name}', 'neuron': name}
+    for name in ['AdExIF', 'AdExIFLTC', 'AdExIFRef', 'AdExIFRefLTC', 'Gif', 'GifLTC', 'GifRef', 'GifRefLTC']
+  )
+  def test_V_dtype_states(self, neuron):
+    if neuron.startswith('Gif'):
+      # the slow threshold dynamics are partly lost in float16
+      states, amp, tol = ['V', 'V_th', 'I1', 'I2'], 1., 1
+      kwargs = dict(A1=0.5, A2=-0.2, a=0.005)
+    else:
+      states, amp, tol, kwargs = ['V', 'w'], 10., 0, dict()
+    model1 = getattr(lif, neuron)(size=10, V_initializer=bp.init.Constant(-65.), **kwargs)
+    model2 = getattr(lif, neuron)(size=10, V_initializer=bp.init.Constant(-65.), V_dtype=bm.float16, **kwargs)
+    for key in states:
+      self.assertEqual(getattr(model2, key).dtype, bm.float16)
+    inputs = bm.ones((200, 10)) * bm.linspace(0.5, 3., 10) * amp
+    run = lambda model: bm.for_loop(lambda i, x: model.step_run(i, x), (bm.arange(200), inputs))
+    spks1 = run(model1)
+    spks2 = run(model2)
+    self.assertTrue(spks1.sum() > 0)
+    for key in states:
+      self.assertEqual(getattr(model2, key).dtype, bm.float16)
+    self.assertTrue(np.abs(spks1.sum(0) - spks2.sum(0)).max() <= tol)
+    if tol == 0:
+      self.assertTrue(np.allclose(model1.V, model2.V.astype(bm.float32), atol=1.))
+
+  @parameterized.named_parameters(
+    {'testcase_name': f'{name}', 'neuron': name}
+    for name in ['AdExIF', 'AdExIFLTC', 'AdExIFRef', 'Gif', 'GifRefLTC', 'Izhikevich', 'IzhikevichRef']
+  )
+  def test_fuse(self, neuron):
+    kwargs = dict(ref_var=True, tau_ref=1.) if 'Ref' in neuron else dict()
+    a = {'A': (0.5, 1.5), 'G': (0., 0.01), 'I': (0.01, 0.03)}[neuron[0]]
+    amp = 0.1 if neuron.startswith('Gif') else 1.
+    sizes = [5, 7, 3]
+    groups = [getattr(lif, neuron)(size=n, V_initializer=bp.init.Constant(-65.), tau=10. + i,
+                                   a=bm.linspace(*a, n), **kwargs)
+              for i, n in enumerate(sizes)]
+    fused, views = getattr(lif, neuron).fuse(groups)
+    self.assertEqual(fused.num, sum(sizes))
+    inputs = bm.asarray(np.random.RandomState(0).uniform(10., 40., (200, sum(sizes)))) * amp
+    spks = bm.for_loop(lambda i, x: fused.step_run(i, x), (bm.arange(200), inputs))
+    start = 0
+    for group, view, n in zip(groups, views, sizes):
+      group_spks = bm.for_loop(lambda i, x: group.step_run(i, x), (bm.arange(200), inputs[:, start: start + n]))
+      self.assertTrue(np.array_equal(group_spks, spks[:, start: start + n]))
+      self.assertTrue(np.allclose(group.V, view.V, atol=1e-4))
+      start += n
+    with self.assertRaises(TypeError):
+      lif.AdExIF.fuse([lif.AdExIF(2), lif.AdExIFLTC(2)])
+    with self.assertRaises(ValueError):
+      lif.AdExIF.fuse([lif.AdExIF(2), lif.AdExIF(2, spk_reset='hard')])
+
+  @parameterized.named_parameters(
+    {'testcase_name': f'{name}', 'neuron': name}
+    for name in ['Lif', 'LifRef']
+  )
+  def test_max_spikes(self, neuron):
+    model = getattr(lif, neuron)(size=50, max_spikes=50)
+    inputs = bm.random.uniform(0., 40., (100, 50))
+    indices = bm.for_loop(lambda i, x: model.step_run(i, x), (bm.arange(100), inputs))
+    self.assertTupleEqual(indices.shape, (100, 50))
+    last = np.asarray(indices[-1])
+    self.assertTrue(np.array_equal(last[last >= 0], np.nonzero(np.asarray(model.spike))[0]))
+
+  @parameterized.named_parameters(
+    dict(testcase_name='IF', neuron='IF', kernel='if_step'),
+    dict(testcase_name='Lif', neuron='Lif', kernel='lif_step'),
+    dict(testcase_name='LifRef', neuron='LifRef', kernel='lif_ref_step',
+         kwargs=dict(ref_var=True, tau_ref=2.05)),
+    dict(testcase_name='LifRef_ref_counter', neuron='LifRef', kernel='lif_ref_counter_step',
+         kwargs=dict(ref_var=True, ref_counter=True, tau_ref=1.55)),
+    dict(testcase_name='LifRef_heterogeneous', neuron='LifRef', kernel='lif_ref_step',
+         kwargs=dict(V_th=np.linspace(10., 30., 20), tau_ref=2.05)),
+    *[dict(testcase_name=name, neuron=name, kernel=kernel, high=40., num=200, atol=1e-2,
+           kwargs=dict(V_initializer=bp.init.Constant(-65.), **ref_kwargs))
+      for name, kernel, ref_kwargs in [('AdExIF', 'adex_step', {}),
+                                       ('AdExIFLTC', 'adex_step', {}),
+                                       ('AdExIFRef', 'adex_ref_step', dict(tau_ref=1.55, ref_var=True)),
+                                       ('AdExIFRefLTC', 'adex_ref_step', dict(tau_ref=1.55, ref_var=True)),
+                                       ('QuaIF', 'quaif_step', {}),
+                                       ('AdQuaIF', 'adquaif_step', {})]],
+    *[dict(testcase_name=name, neuron=name, kernel='gif_step', low=1., high=3., num=200, atol=1e-3,
+           kwargs=dict(V_initializer=bp.init.Constant(-65.), A1=0.5, A2=-0.2, R1=0.5, a=np.linspace(0., 0.01, 20)))
+      for name in ['Gif', 'GifLTC']],
+  )
+  @skip_without_numba
+  def test_numba_update(self, neuron, kernel, kwargs=None, low=20., high=60., num=100, atol=1e-4):
+    kwargs = dict() if kwargs is None else kwargs
+    model1 = getattr(lif, neuron)(size=20, **kwargs)
+    model2 = getattr(lif, neuron)(size=20, **kwargs)
+    # fixed inputs and refractory periods off the time grid, so that no neuron sits
+    # on the edge of the threshold or of the refractory period by chance
+    inputs = bm.asarray(np.random.RandomState(0).uniform(low, high, (num, 20)))
+    outs1 = bm.for_loop(lambda i, x: model1.step_run(i, x), (bm.arange(num), inputs))
+    with mock.patch.object(_numba_lif, kernel, wraps=getattr(_numba_lif, kernel)) as step:
+      outs2 = np.stack([model2.step_run(i, inputs[i]) for i in range(num)])
+    self.assertEqual(step.call_count, num)
+    if neuron == 'IF':
+      self.assertTrue(np.allclose(outs1, outs2, atol=atol))
+    else:
+      self.assertTrue(outs1.sum() > 0)
+      self.assertTrue(np.array_equal(outs1, outs2))
+    for key in ['V', 'w', 'V_th', 'I1', 'I2', 't_last_spike']:
+      if hasattr(model1, key):
+        self.assertTrue(np.allclose(getattr(model1, key), getattr(model2, key), atol=atol))
+    for key in ['spike', 'refractory', 'steps_since_spike']:
+      if hasattr(model1, key):
+        self.assertTrue(np.array_equal(getattr(model1, key), getattr(model2, key)))
+
+  @parameterized.named_parameters(
+    {'testcase_name': f'{name}', 'neuron': name}
+    for name in ['ExpIFRefLTC', 'AdExIFRefLTC', 'QuaIFRefLTC', 'AdQuaIFRefLTC', 'GifRefLTC', 'IzhikevichRefLTC']
+  )
+  def test_ref_noise(self, neuron):
+    from brainpy._src.integrators.sde.base import SDEIntegrator
+    model = getattr(lif, neuron)(size=3, noise=0.1)
+    self.assertIsInstance(model.integral, SDEIntegrator)
+
+  def test_qif_advance(self):
+    xs = bm.asarray([0., 5., 10., 20., 40.])
+    model1 = lif.QuaIF(5, V_initializer=bp.init.Constant(-60.), method='rk4')
+    model2 = lif.QuaIF(5, V_initializer=bp.init.Constant(-60.))
+    runner = bp.DSRunner(model1, monitors=['spike'], dt=0.005, progress_bar=False)
+    runner.run(inputs=bm.broadcast_to(xs, (20000, 5)))
+    spikes = np.asarray(runner.mon.spike)
+    self.assertTrue(np.allclose(model2.time_to_spike(xs)[1:], spikes.argmax(0)[1:] * 0.005, rtol=1e-2))
+    num, first = model2.advance(100., xs)
+    self.assertTrue(np.array_equal(num, spikes.sum(0)))
+    self.assertTrue(np.isinf(first[0]))
+    self.assertTrue(np.allclose(model1.V, model2.V, atol=0.5))
+    with self.assertRaises(ValueError):
+      lif.QuaIFRef(5).advance(100., xs)
+
+  def test_sum_current_inputs(self):
+    model = lif.Lif(10)
+    outs = [bp.dyn.COBA(E=0.), bp.dyn.COBA(E=-80.), bp.dyn.COBA(E=bm.ones(10)),
+            bp.dyn.CUBA(), bp.dyn.CUBA(), bp.dyn.MgBlock(E=0.)]
+    for i, out in enumerate(outs):
+      out.bind_cond(bm.random.rand(10))
+      model.add_inp_fun(f'out{i}', out)
+    model.add_inp_fun('fun', lambda V: V * 0.1)
+    V = bm.random.uniform(-70., -50., 10)
+    expected = 1. + sum(out(V) for out in outs) + V * 0.1
+    self.assertTrue(np.allclose(model.sum_current_inputs(V, init=1.), expected, atol=1e-4))
+    outs[0].unbind_cond()
+    with self.assertRaises(ValueError):
+      model.sum_current_inputs(V)
+
+  def test_homogeneous_params(self):
+    model = lif.LifRef(10, tau=bp.init.Constant(5.), V_rest=bp.init.ZeroInit(), tau_ref=bm.ones(10))
+    self.assertEqual(model.tau, 5.)
+    self.assertEqual(model.V_rest, 0.)
+    self.assertTupleEqual(model.tau_ref.shape, (10,))
+    model = lif.LifRef(10, tau=5, V_rest=-65., tau_ref=bm.Variable(bm.asarray(2.)))
+    self.assertEqual(model.tau, 5)
+    self.assertEqual(model.V_rest, -65.)
+    self.assertIsInstance(model.tau_ref, bm.Variable)
+
+  def test_inplace_scalar_array_update(self):
+    tau = bm.asarray(10.)
+    model = lif.Lif(3, tau=tau)
+    self.assertIs(model.tau, tau)
+    tau[...] = 1000.
+    model.step_run(0, 1.)
+    self.assertTrue(np.allclose(model.V, 1. - np.exp(-bm.get_dt() / 1000.), atol=1e-6))
+
+  @parameterized.named_parameters(
+    {'testcase_name': f'{name}', 'neuron': name}
+    for name in ['Lif', 'LifRef']
+  )
+  def test_inplace_tau_update(self, neuron):
+    model = getattr(lif, neuron)(3, tau=bm.ones(3) * 10.)
+    model.step_run(0, 1.)
+    model.tau[:] = 1000.
+    model.reset_state()
+    model.step_run(0, 1.)
+    self.assertTrue(np.allclose(model.V, 1. - np.exp(-bm.get_dt() / 1000.), atol=1e-6))
+
+  @parameterized.named_parameters(
+    {'testcase_name': f'{name}', 'neuron': name}
+    for name in ['Lif', 'LifRef']
+  )
+  def test_inplace_param_update(self, neuron):
+    model = getattr(lif, neuron)(3, V_th=bm.ones(3) * 20.)
+    self.assertFalse(np.any(model.step_run(0, 100.)))
+    model.V_th[:] = 0.5
+    model.reset_state()
+    self.assertTrue(np.all(model.step_run(0, 100.)))
+
+  @parameterized.named_parameters(
+    {'testcase_name': f'{name}', 'neuron': name}
+    for name in ['Gif', 'GifRef']
+  )
+  def test_inplace_gif_param_update(self, neuron):
+    model = getattr(lif, neuron)(3, k1=bm.ones(3) * 0.2, I1_initializer=bp.init.Constant(1.))
+    model.step_run(0, 0.)
+    model.k1[:] = 10.
+    model.reset_state()
+    model.step_run(0, 0.)
+    self.assertTrue(np.allclose(model.I1, np.exp(-10. * bm.get_dt()), atol=1e-6))
+
+  @parameterized.named_parameters(
+    {'testcase_name': f'{name}', 'neuron': name}
+    for name in ['IF', 'Lif', 'LifRef', 'QuaIF', 'Gif']
+  )
+  def test_grad_of_params(self, neuron):
+    model = getattr(lif, neuron)(5, tau=bm.TrainVar(bm.ones(5) * 10.))
+
+    def loss():
+      model.reset_state()
+      model.step_run(0, 5.)
+      return model.V.value.sum()
+
+    grad = bm.grad(loss, grad_vars=model.tau)
+    self.assertTrue(np.allclose(grad(), bm.jit(grad)(), atol=1e-6))
+
+    model = getattr(lif, neuron)(5)
+
+    def loss_of_tau(tau):
+      model.tau = tau
+      return loss()
+
+    grad = jax.grad(loss_of_tau)
+    self.assertTrue(np.allclose(grad(10.), jax.jit(grad)(10.), atol=1e-6))
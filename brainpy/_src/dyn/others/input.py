@@ -187,6 +187,12 @@ class SpikeTimeGroup(NeuDyn):
     self.i += 1
 
 
+@partial(jax.jit, static_argnums=(2, 3))
+def _poisson_spikes(key, prob, shape, dtype):
+  """One batched draw of all neurons, the threshold and the cast in a single kernel."""
+  return jnp.asarray(jax.random.uniform(key, shape, minval=0., maxval=1.) <= prob, dtype=dtype)
+
+
 class PoissonGroup(NeuDyn):
   """Poisson Neuron Group.
   """
@@ -219,8 +225,9 @@ class PoissonGroup(NeuDyn):
     self.reset_state(self.mode)
 
   def update(self):
-    spikes = bm.random.rand_like(self.spike) <= (self.freqs * share['dt'] / 1000.)
-    spikes = bm.asarray(spikes, dtype=self.spk_type)
+    prob = self.freqs * share['dt'] / 1000.
+    spikes = _poisson_spikes(bm.random.split_key(), prob.value if isinstance(prob, bm.Array) else prob,
+                             self.spike.shape, self.spk_type)
     # spikes = bm.sharding.partition(spikes, self.spike.sharding)
     self.spike.value = spikes
     return spikes
@@ -22,3 +22,11 @@ class Test_input(parameterized.TestCase):
                          progress_bar=False)
     runner.run(30.)
     self.assertTupleEqual(runner.mon['spike'].shape, (300, 2))
+
+  def test_PoissonGroup_rate(self):
+    bp.math.random.seed(0)
+    model = input.PoissonGroup(size=1000, freqs=bp.math.ones(1000) * 50.)
+    runner = bp.DSRunner(model, monitors=['spike'], progress_bar=False)
+    runner.run(100.)
+    self.assertEqual(runner.mon['spike'].dtype, model.spk_type)
+    self.assertAlmostEqual(runner.mon['spike'].mean() / bp.math.get_dt() * 1e3, 50., delta=2.)
@@ -1,4 +1,6 @@
-from typing import Optional
+import functools
+import operator
+from typing import Optional, Sequence
 
 import brainpy.math as bm
 from brainpy._src.dynsys import DynamicalSystem
@@ -25,11 +27,25 @@ class SynOut(DynamicalSystem, ParamDesc, BindCondData):
       self.scaling = scaling
 
   def __call__(self, *args, **kwargs):
+    ret = self.update(self.get_cond(), *args, **kwargs)
+    return ret
+
+  def get_cond(self):
+    """Get the conductance data packed at the current step."""
     if self._conductance is None:
       raise ValueError(f'Please first pack conductance data at the current step using '
                        f'".{BindCondData.bind_cond.__name__}(data)". {self}')
-    ret = self.update(self._conductance, *args, **kwargs)
-    return ret
+    return self._conductance
+
+  @classmethod
+  def sum_outputs(cls, outs: Sequence['SynOut'], *args, **kwargs):
+    """Sum the outputs of several synaptic outputs of this class.
+
+    It is used by :py:meth:`~.SupportInputProj.sum_current_inputs` to evaluate
+    all synaptic outputs of the same class onto a neuron group at once.
+    Subclasses can override it to compute the sum in fewer operations.
+    """
+    return functools.reduce(operator.add, [out(*args, **kwargs) for out in outs])
 
   def reset_state(self, *args, **kwargs):
     pass
@@ -1,8 +1,11 @@
 from typing import Union, Optional, Sequence
 
+import jax
+import jax.numpy as jnp
 import numpy as np
 
 from brainpy import math as bm, initialize as init
+from brainpy._src.math.ndarray import _as_jax_array_
 from brainpy.types import ArrayType
 from .base import SynOut
 
@@ -13,6 +16,22 @@ __all__ = [
 ]
 
 
+@jax.jit
+def _coba_sum(conductances, E, potential):
+  return sum(g * (e - potential) for g, e in zip(conductances, E))
+
+
+@jax.jit
+def _cuba_sum(conductances):
+  return sum(conductances)
+
+
+@jax.jit
+def _mg_block_current(conductance, potential, E, V_offset, cc_Mg, alpha, beta):
+  norm = 1 + cc_Mg / beta * jnp.exp(alpha * (V_offset - potential))
+  return conductance * (E - potential) / norm
+
+
 class COBA(SynOut):
   r"""Conductance-based synaptic output.
 
@@ -53,6 +72,14 @@ class COBA(SynOut):
   def update(self, conductance, potential):
     return conductance * (self.E - potential)
 
+  @classmethod
+  def sum_outputs(cls, outs, potential):
+    if cls.update is not COBA.update:
+      return super().sum_outputs(outs, potential)
+    return _coba_sum(tuple(_as_jax_array_(out.get_cond()) for out in outs),
+                     tuple(_as_jax_array_(out.E) for out in outs),
+                     _as_jax_array_(potential))
+
 
 class CUBA(SynOut):
   r"""Current-based synaptic output.
@@ -84,6 +111,12 @@ class CUBA(SynOut):
   def update(self, conductance, potential=None):
     return conductance
 
+  @classmethod
+  def sum_outputs(cls, outs, potential=None):
+    if cls.update is not CUBA.update:
+      return super().sum_outputs(outs, potential)
+    return _cuba_sum(tuple(_as_jax_array_(out.get_cond()) for out in outs))
+
 
 class MgBlock(SynOut):
   r"""Synaptic output based on Magnesium blocking.
@@ -138,5 +171,5 @@ class MgBlock(SynOut):
     self.beta = init.parameter(beta, np.shape(beta), sharding=sharding)
 
   def update(self, conductance, potential):
-    norm = (1 + self.cc_Mg / self.beta * bm.exp(self.alpha * (self.V_offset - potential)))
-    return conductance * (self.E - potential) / norm
+    return _mg_block_current(*map(_as_jax_array_, (conductance, potential, self.E, self.V_offset,
+                                                   self.cc_Mg, self.alpha, self.beta)))
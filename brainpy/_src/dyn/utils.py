@@ -1,8 +1,15 @@
 from typing import Optional, Union
+
+import jax
+import jax.numpy as jnp
+
 import brainpy.math as bm
 
 __all__ = [
   'get_spk_type',
+  'pack_spikes',
+  'unpack_spikes',
+  'spike_indices',
 ]
 
 
@@ -14,3 +21,72 @@ def get_spk_type(spk_type: Optional[type] = None, mode: Optional[bm.Mode] = None
   else:
     assert isinstance(mode, bm.Mode)
     return bm.bool if (spk_type is None) else spk_type
+
+
+def pack_spikes(spike, dtype=jnp.uint32):
+  """Pack the spikes along the last axis into the bits of unsigned integers.
+
+  The spike of the ``i``-th neuron is stored in the bit ``i % nbits`` of
+  the ``i // nbits``-th word, where ``nbits`` is the bit width of ``dtype``.
+
+  Args:
+    spike: ArrayType. The boolean (or 0/1 float) spikes.
+    dtype: The unsigned integer type of the packed words. The 64-bit words,
+      i.e., ``uint64``, require the 64-bit mode of JAX (see :py:func:`brainpy.math.enable_x64`).
+
+  Returns:
+    The packed spikes, with the shape of ``spike.shape[:-1] + (ceil(num / nbits),)``.
+  """
+  spike = bm.as_jax(spike) != 0
+  nbits = jnp.iinfo(dtype).bits
+  if nbits == 64 and not jax.config.jax_enable_x64:
+    # JAX would silently truncate the words to 32 bits, losing half of the spikes
+    raise ValueError(f'Packing the spikes into {jnp.dtype(dtype).name} words requires the 64-bit mode. '
+                     f'Please call "brainpy.math.enable_x64()" first.')
+  pad = (-spike.shape[-1]) % nbits
+  spike = jnp.pad(spike, [(0, 0)] * (spike.ndim - 1) + [(0, pad)])
+  spike = spike.reshape(spike.shape[:-1] + (-1, nbits)).astype(dtype)
+  bits = jnp.left_shift(jnp.ones((), dtype=dtype), jnp.arange(nbits, dtype=dtype))
+  return jnp.sum(spike * bits, axis=-1, dtype=dtype)
+
+
+def unpack_spikes(spike_bits, num: int, dtype=bool):
+  """Unpack the spikes packed by :py:func:`pack_spikes`.
+
+  Args:
+    spike_bits: ArrayType. The packed spikes.
+    num: int. The number of neurons along the last axis.
+    dtype: The data type of the unpacked spikes.
+
+  Returns:
+    The dense spikes, with the shape of ``spike_bits.shape[:-1] + (num,)``.
+  """
+  spike_bits = bm.as_jax(spike_bits)
+  nbits = jnp.iinfo(spike_bits.dtype).bits
+  spike = jnp.right_shift(spike_bits[..., None], jnp.arange(nbits, dtype=spike_bits.dtype)) & 1
+  spike = spike.reshape(spike_bits.shape[:-1] + (-1,))[..., :num]
+  return spike.astype(dtype)
+
+
+def spike_indices(spike, max_num: int):
+  """Get the indices of the spiking neurons along the last axis.
+
+  The result has a fixed size so that it can be used under JIT compilation.
+  When more than ``max_num`` neurons spike, only the first ``max_num`` ones
+  are returned; when fewer neurons spike, the result is padded with ``-1``.
+
+  Args:
+    spike: ArrayType. The boolean (or 0/1 float) spikes.
+    max_num: int. The maximum number of spikes.
+
+  Returns:
+    The ``int32`` indices, with the shape of ``spike.shape[:-1] + (max_num,)``.
+  """
+  spike = bm.as_jax(spike) != 0
+
+  def f(s):
+    return jnp.nonzero(s, size=max_num, fill_value=-1)[0].astype(jnp.int32)
+
+  for _ in range(spike.ndim - 1):
+    f = jax.vmap(f)
+  return f(spike)
@@ -2,11 +2,14 @@
 
 from typing import Union, Callable, Optional
 
+import jax
 import jax.numpy as jnp
 
 import brainpy.math as bm
 from brainpy._src.dynold.synapses.base import _SynOut
 from brainpy._src.initialize import parameter, Initializer
+from brainpy._src.initialize.generic import _homogeneous_scalar
+from brainpy._src.math.ndarray import _as_jax_array_
 from brainpy.types import ArrayType
 
 __all__ = [
@@ -14,6 +17,18 @@ __all__ = [
 ]
 
 
+def _init_param(param, size):
+  """Homogeneous parameters are kept as Python scalars, so that the blocking
+  current does not read a whole array per parameter."""
+  value = _homogeneous_scalar(param)
+  return parameter(param, size, allow_none=False) if value is None else value
+
+
+@jax.jit
+def _mg_block_current(g, V, E, cc_Mg, alpha, beta):
+  return g * (E - V) / (1 + cc_Mg / beta * jnp.exp(-alpha * V))
+
+
 class MgBlock(_SynOut):
   r"""Synaptic output based on Magnesium blocking.
 
@@ -66,10 +81,10 @@ class MgBlock(_SynOut):
   def register_master(self, master):
     super().register_master(master)
 
-    self.E = parameter(self._E, self.master.post.num, allow_none=False)
-    self.cc_Mg = parameter(self._cc_Mg, self.master.post.num, allow_none=False)
-    self.alpha = parameter(self._alpha, self.master.post.num, allow_none=False)
-    self.beta = parameter(self._beta, self.master.post.num, allow_none=False)
+    self.E = _init_param(self._E, self.master.post.num)
+    self.cc_Mg = _init_param(self._cc_Mg, self.master.post.num)
+    self.alpha = _init_param(self._alpha, self.master.post.num)
+    self.beta = _init_param(self._beta, self.master.post.num)
     if isinstance(self._membrane_var, str):
       if not hasattr(self.master.post, self._membrane_var):
         raise KeyError(f'Post-synaptic group does not have membrane variable: {self._membrane_var}')
@@ -81,8 +96,7 @@ class MgBlock(_SynOut):
                       f'But we got {type(self._membrane_var)}')
 
   def filter(self, g):
-    V = self.membrane_var.value
-    I = g * (self.E - V) / (1 + self.cc_Mg / self.beta * jnp.exp(-self.alpha * V))
+    I = _mg_block_current(*map(_as_jax_array_, (g, self.membrane_var, self.E, self.cc_Mg, self.alpha, self.beta)))
     return super(MgBlock, self).filter(I)
 
   def clone(self):
@@ -10,6 +10,7 @@ import brainpy.math as bm
 from brainpy.tools import to_size
 from brainpy.types import Shape, ArrayType, Sharding
 from .base import Initializer
+from .regular_inits import ZeroInit, Constant
 
 __all__ = [
   'parameter',
@@ -34,6 +35,22 @@ def _check_var(x):
   return x
 
 
+def _homogeneous_scalar(param):
+  """Get the Python scalar of a homogeneous parameter, or None if ``param`` is not homogeneous.
+
+  A homogeneous parameter is a Python number, ``ZeroInit()``, or ``Constant()`` with
+  a scalar value. Arrays are not homogeneous parameters, even zero-dimensional ones,
+  so that they are shared with the caller and their in-place updates are kept.
+  """
+  if isinstance(param, (int, float)) and not isinstance(param, bool):
+    return param
+  if isinstance(param, ZeroInit):
+    return 0.
+  if isinstance(param, Constant) and isinstance(param.value, (int, float)):
+    return param.value
+  return None
+
+
 def parameter(
     param: Union[Callable, Initializer, bm.Array, np.ndarray, jax.Array, float, int, bool],
     sizes: Shape,
@@ -11,12 +11,11 @@ can make.
 
 """
 
-import operator
+from functools import partial, wraps
 
 import jax
 import jax.numpy as jnp
 import jax.scipy
-import numpy as np
 
 from .ndarray import Array
 from .random import uniform
@@ -55,21 +54,37 @@ __all__ = [
 ]
 
 
-def get(activation):
-  global_vars = globals()
+def _in_float32(fun):
+  """Evaluate ``fun`` in ``float32`` for half-precision inputs, and cast the result back.
+
+  Inside the jitted kernels the casts are fused, so the memory traffic stays in
+  the input type, while the intermediate results are not rounded to half precision.
+  """
+
+  @wraps(fun)
+  def wrapper(x, *args):
+    x = jnp.asarray(x)
+    if x.dtype in (jnp.float16, jnp.bfloat16):
+      return fun(x.astype(jnp.float32), *args).astype(x.dtype)
+    return fun(x, *args)
+
+  return wrapper
 
+
+def get(activation):
   if activation is None:
     return None
 
   if isinstance(activation, str):
-    if activation not in global_vars:
+    try:
+      return _activations[activation]
+    except KeyError:
       raise ValueError(f'Unknown activation function: {activation}, \nwe only support: '
-                       f'{[k for k, v in global_vars.items() if not k.startswith("_") and callable(v)]}')
+                       f'{list(_activations)}') from None
   elif callable(activation):
     return activation
   else:
     raise ValueError(f'Unknown activation function {activation}. ')
-  return global_vars[activation]
 
 
 def identity(x):
@@ -100,7 +115,14 @@ def celu(x, alpha=1.0):
   """
   x = x.value if isinstance(x, Array) else x
   alpha = alpha.value if isinstance(alpha, Array) else alpha
-  return jnp.where(x > 0, x, alpha * jnp.expm1(x / alpha))
+  return _celu(x, alpha)
+
+
+@jax.jit
+@_in_float32
+def _celu(x, alpha):
+  safe_x = jnp.where(x > 0, 0., x)
+  return jnp.where(x > 0, x, alpha * jnp.expm1(safe_x / alpha))
 
 
 def elu(x, alpha=1.0):
@@ -123,6 +145,12 @@ def elu(x, alpha=1.0):
   """
   x = x.value if isinstance(x, Array) else x
   alpha = alpha.value if isinstance(alpha, Array) else alpha
+  return _elu(x, alpha)
+
+
+@jax.jit
+@_in_float32
+def _elu(x, alpha):
   safe_x = jnp.where(x > 0, 0., x)
   return jnp.where(x > 0, x, alpha * jnp.expm1(safe_x))
 
@@ -154,12 +182,23 @@ def gelu(x, approximate=True):
   """
   x = x.value if isinstance(x, Array) else x
   if approximate:
-    sqrt_2_over_pi = np.sqrt(2 / np.pi).astype(x.dtype)
-    cdf = 0.5 * (1.0 + jnp.tanh(sqrt_2_over_pi * (x + 0.044715 * (x ** 3))))
-    y = x * cdf
+    return _gelu_approx(x)
   else:
-    y = jnp.array(x * (jax.lax.erf(x / np.sqrt(2)) + 1) / 2, dtype=x.dtype)
-  return y
+    return _gelu_exact(x)
+
+
+@jax.jit
+@_in_float32
+def _gelu_approx(x):
+  # the cubic term in the Horner form, with "sqrt(2 / pi)" folded into the coefficients
+  return 0.5 * x * (1.0 + jnp.tanh(x * (0.7978845608028654 + 0.035677408136300125 * x * x)))
+
+
+@jax.jit
+@_in_float32
+def _gelu_exact(x):
+  x = jnp.asarray(x)
+  return (x * (jax.lax.erf(x * 0.7071067811865476) + 1.) * 0.5).astype(x.dtype)
 
 
 def glu(x, axis=-1):
@@ -175,7 +214,14 @@ def glu(x, axis=-1):
   size = x.shape[axis]
   assert size % 2 == 0, "axis size must be divisible by 2"
   x = x.value if isinstance(x, Array) else x
-  x1, x2 = jnp.split(x, 2, axis)
+  return _glu(x, axis)
+
+
+@partial(jax.jit, static_argnames='axis')
+def _glu(x, axis):
+  half = x.shape[axis] // 2
+  x1 = jax.lax.slice_in_dim(x, 0, half, axis=axis)
+  x2 = jax.lax.slice_in_dim(x, half, 2 * half, axis=axis)
   return x1 * sigmoid(x2)
 
 
@@ -201,7 +247,15 @@ def hard_tanh(x, min_val=- 1.0, max_val=1.0):
     maximum value of the linear region range. Default: 1
   """
   x = x.value if isinstance(x, Array) else x
-  return jnp.where(x > max_val, max_val, jnp.where(x < min_val, min_val, x))
+  min_val = min_val.value if isinstance(min_val, Array) else min_val
+  max_val = max_val.value if isinstance(max_val, Array) else max_val
+  return _clamp(x, min_val, max_val)
+
+
+def _clamp(x, lower, upper):
+  # one "clamp" operation, whose bounds should have the data type of "x"
+  x = jnp.asarray(x)
+  return jax.lax.clamp(jnp.asarray(lower, x.dtype), x, jnp.asarray(upper, x.dtype))
 
 
 def hard_sigmoid(x):
@@ -217,7 +271,14 @@ def hard_sigmoid(x):
   x: ArrayType
     The input array.
   """
-  return relu6(x + 3.) / 6.
+  x = x.value if isinstance(x, Array) else x
+  return _hard_sigmoid(x)
+
+
+@jax.jit
+def _hard_sigmoid(x):
+  # "relu6(x + 3) / 6" as one multiply-add and one clamp
+  return _clamp(x * (1. / 6.) + 0.5, 0., 1.)
 
 
 def tanh_shrink(x):
@@ -227,6 +288,11 @@ def tanh_shrink(x):
       \text{Tanhshrink}(x) = x - \tanh(x)
   """
   x = x.value if isinstance(x, Array) else x
+  return _tanh_shrink(x)
+
+
+@jax.jit
+def _tanh_shrink(x):
   return x - jnp.tanh(x)
 
 
@@ -243,7 +309,13 @@ def hard_silu(x):
   x: ArrayType
     The input array.
   """
-  return x * hard_sigmoid(x)
+  x = x.value if isinstance(x, Array) else x
+  return _hard_silu(x)
+
+
+@jax.jit
+def _hard_silu(x):
+  return x * _hard_sigmoid(x)
 
 
 hard_swish = hard_silu
@@ -271,6 +343,11 @@ def hard_shrink(x, lambd=0.5):
 
   """
   x = x.value if isinstance(x, Array) else x
+  return _hard_shrink(x, lambd)
+
+
+@jax.jit
+def _hard_shrink(x, lambd):
   return jnp.where(x > lambd, x, jnp.where(x < -lambd, x, 0.))
 
 
@@ -295,6 +372,11 @@ def leaky_relu(x, negative_slope=1e-2):
     The scalar specifying the negative slope (default: 0.01)
   """
   x = x.value if isinstance(x, Array) else x
+  return _leaky_relu(x, negative_slope)
+
+
+@jax.jit
+def _leaky_relu(x, negative_slope):
   return jnp.where(x >= 0, x, negative_slope * x)
 
 
@@ -320,6 +402,11 @@ def softplus(x, beta: float = 1., threshold: float = 20.):
 
   """
   x = x.value if isinstance(x, Array) else x
+  return _softplus(x, beta, threshold)
+
+
+@jax.jit
+def _softplus(x, beta, threshold):
   return jnp.where(x > threshold / beta, x, 1 / beta * jnp.logaddexp(beta * x, 0))
 
 
@@ -336,7 +423,14 @@ def log_sigmoid(x):
   x: ArrayType
     The input array.
   """
-  return -softplus(-x)
+  x = x.value if isinstance(x, Array) else x
+  return _log_sigmoid(x)
+
+
+@jax.jit
+def _log_sigmoid(x):
+  # stable on both tails: "exp" only sees non-positive values
+  return jnp.minimum(x, 0) - jnp.log1p(jnp.exp(-jnp.abs(x)))
 
 
 def soft_shrink(x, lambd=0.5):
@@ -358,6 +452,11 @@ def soft_shrink(x, lambd=0.5):
       - Output: :math:`(*)`, same shape as the input.
   """
   x = x.value if isinstance(x, Array) else x
+  return _soft_shrink(x, lambd)
+
+
+@jax.jit
+def _soft_shrink(x, lambd):
   return jnp.where(x > lambd, x - lambd, jnp.where(x < -lambd, x + lambd, 0.))
 
 
@@ -380,22 +479,18 @@ def log_softmax(x, axis=-1):
     computed. Either an integer or a tuple of integers.
   """
   x = x.value if isinstance(x, Array) else x
-  shifted = x - jax.lax.stop_gradient(x.max(axis, keepdims=True))
-  return shifted - jnp.log(jnp.sum(jnp.exp(shifted), axis, keepdims=True))
-  # exp = jnp.exp(x)
-  # return jnp.log(exp / exp.sum(axis=axis, keepdims=True))
+  return _log_softmax(x, _static_axis(axis))
 
 
-def _canonicalize_axis(axis, num_dims) -> int:
-  """Canonicalize an axis in [-num_dims, num_dims) to [0, num_dims)."""
-  axis = operator.index(axis)
-  if not -num_dims <= axis < num_dims:
-    raise ValueError(
-      "axis {} is out of bounds for array of dimension {}".format(
-        axis, num_dims))
-  if axis < 0:
-    axis = axis + num_dims
-  return axis
+def _static_axis(axis):
+  return tuple(axis) if isinstance(axis, list) else axis
+
+
+@partial(jax.jit, static_argnames='axis')
+def _log_softmax(x, axis):
+  # the maximum is subtracted first, so that the result stays exact for large logits
+  shifted = x - jax.lax.stop_gradient(x.max(axis, keepdims=True))
+  return shifted - jnp.log(jnp.sum(jnp.exp(shifted), axis, keepdims=True))
 
 
 def one_hot(x, num_classes, *, dtype=None, axis=-1):
@@ -425,42 +520,31 @@ def one_hot(x, num_classes, *, dtype=None, axis=-1):
     axis: the axis or axes along which the function should be
       computed.
   """
-  num_classes = jax.core.concrete_or_error(
-    int, num_classes, "The error arose in jax.nn.one_hot argument `num_classes`.")
-  dtype = jax.dtypes.canonicalize_dtype(jnp.float64 if dtype is None else dtype)
-  x = jnp.asarray(x.value if isinstance(x, Array) else x)
-  try:
-    output_pos_axis = _canonicalize_axis(axis, x.ndim + 1)
-  except TypeError:
-    axis_size = jax.lax.psum(1, axis)
-    if num_classes != axis_size:
-      raise ValueError(f"Expected num_classes to match the size of axis {axis}, "
-                       f"but {num_classes} != {axis_size}") from None
-    axis_idx = jax.lax.axis_index(axis)
-    return jnp.asarray(x == axis_idx, dtype=dtype)
-  axis = operator.index(axis)
-  lhs = jax.lax.expand_dims(x, (axis,))
-  rhs_shape = [1] * x.ndim
-  rhs_shape.insert(output_pos_axis, num_classes)
-  rhs = jax.lax.broadcast_in_dim(jnp.arange(num_classes, dtype=x.dtype),
-                                 rhs_shape,
-                                 (output_pos_axis,))
-  return jnp.asarray(lhs == rhs, dtype=dtype)
+  x = x.value if isinstance(x, Array) else x
+  return jax.nn.one_hot(x, num_classes, dtype=jnp.float64 if dtype is None else dtype, axis=axis)
 
 
 def normalize(x, axis=-1, mean=None, variance=None, epsilon=1e-5):
   """Normalizes an array by subtracting mean and dividing by sqrt(var)."""
   x = x.value if isinstance(x, Array) else x
-  if mean is None:
+  mean = mean.value if isinstance(mean, Array) else mean
+  variance = variance.value if isinstance(variance, Array) else variance
+  return _normalize(x, _static_axis(axis), mean, variance, epsilon)
+
+
+@partial(jax.jit, static_argnames='axis')
+def _normalize(x, axis, mean, variance, epsilon):
+  if mean is None and variance is None:
+    # the two-pass variance does not cancel catastrophically, and the
+    # subtraction, square and reduction are fused into one kernel
     mean = jnp.mean(x, axis, keepdims=True)
-  if variance is None:
-    # this definition is traditionally seen as less accurate than jnp.var's
-    # mean((x - mean(x))**2) but may be faster and even, given typical
-    # activation distributions and low-precision arithmetic, more accurate
-    # when used in neural network normalization layers
-    variance = jnp.mean(jnp.square(x), axis, keepdims=True) - jnp.square(mean)
-  y = (x - mean) * jax.lax.rsqrt(variance + epsilon)
-  return y
+    variance = jnp.mean(jnp.square(x - mean), axis, keepdims=True)
+  else:
+    if mean is None:
+      mean = jnp.mean(x, axis, keepdims=True)
+    if variance is None:
+      variance = jnp.mean(jnp.square(x), axis, keepdims=True) - jnp.square(mean)
+  return (x - mean) * jax.lax.rsqrt(variance + epsilon)
 
 
 def relu(x):
@@ -510,7 +594,7 @@ def relu6(x):
     The input array.
   """
   x = x.value if isinstance(x, Array) else x
-  return jnp.minimum(jnp.maximum(x, 0), 6.)
+  return _clamp(x, 0., 6.)
 
 
 def rrelu(x, lower=0.125, upper=0.3333333333333333, ):
@@ -569,7 +653,8 @@ def prelu(x, a=0.25):
   a separate :math:`a` is used for each input channel.
   """
   x = x.value if isinstance(x, Array) else x
-  return jnp.where(x >= 0., x, a * x)
+  a = a.value if isinstance(a, Array) else a
+  return _leaky_relu(x, a)
 
 
 def sigmoid(x):
@@ -603,6 +688,11 @@ def soft_sign(x):
     The input array.
   """
   x = x.value if isinstance(x, Array) else x
+  return _soft_sign(x)
+
+
+@jax.jit
+def _soft_sign(x):
   return x / (jnp.abs(x) + 1)
 
 
@@ -625,8 +715,12 @@ def softmax(x, axis=-1):
     Either an integer or a tuple of integers.
   """
   x = x.value if isinstance(x, Array) else x
-  unnormalized = jnp.exp(x - jax.lax.stop_gradient(x.max(axis, keepdims=True)))
-  return unnormalized / unnormalized.sum(axis, keepdims=True)
+  return _softmax(x, _static_axis(axis))
+
+
+@partial(jax.jit, static_argnames='axis')
+def _softmax(x, axis):
+  return jax.nn.softmax(x, axis=axis)
 
 
 def softmin(x, axis=-1):
@@ -649,8 +743,7 @@ def softmin(x, axis=-1):
           along dim will sum to 1).
   """
   x = x.value if isinstance(x, Array) else x
-  unnormalized = jnp.exp(-x)
-  return unnormalized / unnormalized.sum(axis, keepdims=True)
+  return _softmax(-x, _static_axis(axis))
 
 
 soft_max = softmax
@@ -670,6 +763,11 @@ def silu(x):
     The input array.
   """
   x = x.value if isinstance(x, Array) else x
+  return _silu(x)
+
+
+@jax.jit
+def _silu(x):
   return x * sigmoid(x)
 
 
@@ -692,7 +790,12 @@ def mish(x):
       - Output: :math:`(*)`, same shape as the input.
   """
   x = x.value if isinstance(x, Array) else x
-  return x * jnp.tanh(softplus(x))
+  return _mish(x)
+
+
+@jax.jit
+def _mish(x):
+  return x * jnp.tanh(_softplus(x, 1., 20.))
 
 
 def selu(x):
@@ -718,8 +821,17 @@ def selu(x):
   x: ArrayType
     The input array.
   """
+  x = x.value if isinstance(x, Array) else x
+  return _selu(x)
+
+
+@jax.jit
+@_in_float32
+def _selu(x):
   alpha = 1.6732632423543772848170429916717
   scale = 1.0507009873554804934193349852946
-  x = x.value if isinstance(x, Array) else x
-  safe_x = jnp.where(x > 0, 0., x)
-  return scale * jnp.where(x > 0, x, alpha * jnp.expm1(safe_x))
+  return scale * _elu(x, alpha)
+
+
+# the name lookup of "get()", including the aliases which are not exported
+_activations = {name: globals()[name] for name in __all__ + ['soft_max']}
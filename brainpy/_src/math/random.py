@@ -56,6 +56,13 @@ def _formalize_key(key):
     raise TypeError('key must be a int or an array with two uint32.')
 
 
+@jit
+def _split_key(key):
+  # one kernel, instead of the split and two indexing operations
+  keys = jr.split(key, num=2)
+  return keys[0], keys[1]
+
+
 def _size2shape(size):
   if size is None:
     return ()
@@ -545,9 +552,8 @@ class RandomState(Variable):
     """
     if not isinstance(self.value, jnp.ndarray):
       self._value = jnp.asarray(self.value)
-    keys = jr.split(self.value, num=2)
-    self._value = keys[0]
-    return keys[1]
+    self._value, key = _split_key(self.value)
+    return key
 
   def split_keys(self, n):
     """Create multiple seeds from the current seed. This is used
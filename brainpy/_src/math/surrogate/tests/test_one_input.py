@@ -49,3 +49,16 @@ class TestOneInputGrad(parameterized.TestCase):
 
     if x64:
       bm.disable_x64()
+
+
+class TestSurrogateCall(parameterized.TestCase):
+  @parameterized.named_parameters(
+    dict(testcase_name=name, name=name)
+    for name in ['Sigmoid', 'Arctan', 'InvSquareGrad']
+  )
+  def test_concrete_and_traced(self, name):
+    fun = getattr(bm.surrogate, name)()
+    xs = bm.arange(-3, 3, 0.005)
+    self.assertTrue(bm.allclose(fun(xs), jax.jit(fun)(xs)))
+    grads = bm.vector_grad(fun)(xs)
+    self.assertTrue(bm.allclose(grads, fun.surrogate_grad(bm.as_jax(xs))))
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+
+import jax
+import jax.numpy as jnp
+import numpy as np
+from absl.testing import parameterized
+
+import brainpy.math as bm
+
+
+class TestActivations(parameterized.TestCase):
+  def setUp(self):
+    self.x = jnp.asarray(np.random.RandomState(0).uniform(-6., 6., 1000), dtype=jnp.float32)
+
+  @parameterized.product(approximate=[True, False])
+  def test_gelu(self, approximate):
+    self.assertTrue(np.allclose(bm.gelu(self.x, approximate), jax.nn.gelu(self.x, approximate), atol=1e-6))
+    self.assertTrue(np.allclose(bm.gelu(bm.asarray(self.x), approximate),
+                                jax.nn.gelu(self.x, approximate), atol=1e-6))
+    self.assertEqual(bm.gelu(self.x.astype(jnp.bfloat16), approximate).dtype, jnp.bfloat16)
+    grad1 = jax.grad(lambda x: bm.gelu(x, approximate).sum())(self.x)
+    grad2 = jax.grad(lambda x: jax.nn.gelu(x, approximate).sum())(self.x)
+    self.assertTrue(np.allclose(grad1, grad2, atol=1e-5))
+
+  @parameterized.named_parameters(
+    {'testcase_name': name, 'name': name}
+    for name in ['elu', 'celu', 'selu']
+  )
+  def test_exponential_linear_units(self, name):
+    kwargs = dict() if name == 'selu' else dict(alpha=0.5)
+    self.assertTrue(np.allclose(getattr(bm, name)(self.x, **kwargs),
+                                getattr(jax.nn, name)(self.x, **kwargs), atol=1e-6))
+    self.assertTrue(np.all(np.isfinite(getattr(bm, name)(jnp.asarray([-1e4, 1e4]), **kwargs))))
+    x = jnp.concatenate([self.x, jnp.zeros(1)])
+    grad1 = jax.grad(lambda x: getattr(bm, name)(x, **kwargs).sum())(x)
+    grad2 = jax.grad(lambda x: getattr(jax.nn, name)(x, **kwargs).sum())(x)
+    self.assertTrue(np.allclose(grad1, grad2, atol=1e-5))
+
+  @parameterized.product(name=['log_softmax', 'softmax'], axis=[-1, 0, (0, 1)])
+  def test_softmax(self, name, axis):
+    x = self.x.reshape(10, 100) * 100.
+    self.assertTrue(np.allclose(getattr(bm, name)(x, axis), getattr(jax.nn, name)(x, axis=axis), rtol=1e-5, atol=1e-5))
+    self.assertTrue(np.allclose(bm.softmin(x, axis), jax.nn.softmax(-x, axis=axis), atol=1e-5))
+    grad1 = jax.grad(lambda x: (getattr(bm, name)(x, axis) * self.x.reshape(10, 100)).sum())(x)
+    grad2 = jax.grad(lambda x: (getattr(jax.nn, name)(x, axis=axis) * self.x.reshape(10, 100)).sum())(x)
+    self.assertTrue(np.allclose(grad1, grad2, atol=1e-4))
+
+  def test_get(self):
+    from brainpy._src.math import activations
+    self.assertIs(activations.get('relu'), bm.relu)
+    self.assertIs(activations.get('swish'), bm.silu)
+    self.assertIs(activations.get('hard_swish'), bm.hard_silu)
+    self.assertIs(activations.get('soft_max'), bm.softmax)
+    self.assertIs(activations.get(bm.tanh), bm.tanh)
+    self.assertIsNone(activations.get(None))
+    with self.assertRaises(ValueError):
+      activations.get('jnp')
+    with self.assertRaises(ValueError):
+      activations.get(1.)
+
+  def test_clamped(self):
+    self.assertTrue(np.allclose(bm.hard_tanh(self.x), jnp.clip(self.x, -1., 1.)))
+    self.assertTrue(np.allclose(bm.hard_tanh(self.x, -2., 3.), jnp.clip(self.x, -2., 3.)))
+    self.assertTrue(np.allclose(bm.relu6(self.x), jax.nn.relu6(self.x)))
+    self.assertEqual(bm.relu6(self.x.astype(jnp.bfloat16)).dtype, jnp.bfloat16)
+    self.assertTrue(np.allclose(jax.vmap(jax.grad(bm.relu6))(self.x), jax.vmap(jax.grad(jax.nn.relu6))(self.x)))
+
+  @parameterized.product(axis=[-1, 0])
+  def test_glu(self, axis):
+    x = self.x.reshape(20, 50)
+    self.assertTrue(np.allclose(bm.glu(x, axis), jax.nn.glu(x, axis), atol=1e-6))
+    self.assertTrue(np.allclose(bm.glu(bm.asarray(x), axis), jax.nn.glu(x, axis), atol=1e-6))
+
+  @parameterized.product(axis=[-1, 0])
+  def test_one_hot(self, axis):
+    x = jnp.asarray([[0, 2, -1], [1, 3, 2]])
+    self.assertTrue(np.array_equal(bm.one_hot(x, 3, axis=axis), jax.nn.one_hot(x, 3, axis=axis)))
+    self.assertTrue(np.array_equal(bm.one_hot(bm.asarray(x), 3, axis=axis), jax.nn.one_hot(x, 3, axis=axis)))
+    self.assertEqual(bm.one_hot(x, 3, dtype=jnp.int32).dtype, jnp.int32)
+    out = jax.vmap(lambda i: bm.one_hot(i, 4, axis='i'), axis_name='i')(jnp.asarray([0, 2, 2, 3]))
+    self.assertTrue(np.array_equal(out, jnp.asarray([1., 0., 1., 1.])))
+
+  def test_normalize(self):
+    x = self.x.reshape(10, 100) + 1e3
+    y = bm.normalize(x)
+    self.assertTrue(np.allclose(y, (x - x.mean(-1, keepdims=True)) / np.sqrt(x.var(-1, keepdims=True) + 1e-5),
+                                atol=1e-4))
+    self.assertTrue(np.allclose(bm.normalize(x, axis=(0, 1)).std(), 1., atol=1e-3))
+    mean = x.mean(0, keepdims=True)
+    self.assertTrue(np.allclose(bm.normalize(x, 0, mean=mean, variance=1.), x - mean, atol=1e-3))
+
+  @parameterized.named_parameters(
+    {'testcase_name': name, 'name': name, 'reference': reference}
+    for name, reference in [
+      ('hard_sigmoid', jax.nn.hard_sigmoid),
+      ('hard_silu', jax.nn.hard_silu),
+      ('tanh_shrink', lambda x: x - jnp.tanh(x)),
+      ('hard_shrink', lambda x: jnp.where(jnp.abs(x) > 0.5, x, 0.)),
+      ('soft_shrink', lambda x: jnp.sign(x) * jnp.maximum(jnp.abs(x) - 0.5, 0.)),
+      ('leaky_relu', jax.nn.leaky_relu),
+      ('prelu', lambda x: jax.nn.leaky_relu(x, 0.25)),
+      ('softplus', jax.nn.softplus),
+      ('log_sigmoid', jax.nn.log_sigmoid),
+      ('sigmoid', jax.nn.sigmoid),
+      ('soft_sign', jax.nn.soft_sign),
+      ('silu', jax.nn.silu),
+      ('mish', lambda x: x * jnp.tanh(jax.nn.softplus(x))),
+    ]
+  )
+  def test_elementwise(self, name, reference):
+    x = self.x * 5.
+    self.assertTrue(np.allclose(getattr(bm, name)(x), reference(x), atol=1e-5))
+    self.assertTrue(np.allclose(getattr(bm, name)(bm.asarray(x)), reference(x), atol=1e-5))
+    grad1 = jax.grad(lambda x: getattr(bm, name)(x).sum())(x)
+    grad2 = jax.grad(lambda x: reference(x).sum())(x)
+    self.assertTrue(np.allclose(grad1, grad2, atol=1e-5))
+
+  @parameterized.named_parameters(
+    {'testcase_name': name, 'name': name}
+    for name in ['gelu', 'elu', 'celu', 'selu']
+  )
+  def test_half_precision(self, name):
+    x = self.x.astype(jnp.bfloat16)
+    y = getattr(bm, name)(x)
+    self.assertEqual(y.dtype, jnp.bfloat16)
+    expected = getattr(bm, name)(x.astype(jnp.float32)).astype(jnp.bfloat16)
+    self.assertTrue(np.allclose(y.astype(jnp.float32), expected.astype(jnp.float32), atol=1e-5))
@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 
+import functools
 import numbers
+import operator
 import sys
 import warnings
 from dataclasses import dataclass
@@ -436,15 +438,7 @@ class SupportInputProj(MixIn):
     Returns:
       The total currents.
     """
-    if label is None:
-      for key, out in self.current_inputs.items():
-        init = init + out(*args, **kwargs)
-    else:
-      label_repr = self._input_label_start(label)
-      for key, out in self.current_inputs.items():
-        if key.startswith(label_repr):
-          init = init + out(*args, **kwargs)
-    return init
+    return self._sum_inputs(self.current_inputs, args, kwargs, init, label)
 
   def sum_delta_inputs(self, *args, init: Any = 0., label: Optional[str] = None, **kwargs):
     """Summarize all delta inputs by the defined input functions ``.delta_inputs``.
@@ -458,15 +452,33 @@ class SupportInputProj(MixIn):
     Returns:
       The total currents.
     """
+    return self._sum_inputs(self.delta_inputs, args, kwargs, init, label)
+
+  def _sum_inputs(self, inputs, args, kwargs, init, label):
+    # evaluate all matched input functions, and accumulate them in a
+    # single reduction which is skipped when there is no input
     if label is None:
-      for key, out in self.delta_inputs.items():
-        init = init + out(*args, **kwargs)
+      funs = list(inputs.values())
     else:
       label_repr = self._input_label_start(label)
-      for key, out in self.delta_inputs.items():
-        if key.startswith(label_repr):
-          init = init + out(*args, **kwargs)
-    return init
+      funs = [out for key, out in inputs.items() if key.startswith(label_repr)]
+    if len(funs) == 0:
+      return init
+    # input functions of the same type which define "sum_outputs" (e.g., the
+    # synaptic outputs) are evaluated together in one call
+    outs = []
+    groups = dict()
+    for fun in funs:
+      if hasattr(type(fun), 'sum_outputs'):
+        groups.setdefault(type(fun), []).append(fun)
+      else:
+        outs.append(fun(*args, **kwargs))
+    for group in groups.values():
+      if len(group) == 1:
+        outs.append(group[0](*args, **kwargs))
+      else:
+        outs.append(type(group[0]).sum_outputs(group, *args, **kwargs))
+    return functools.reduce(operator.add, outs, init)
 
   @classmethod
   def _input_label_start(cls, label: str):